@@ -1,11 +1,55 @@
 import asyncio
 import aiohttp
+import atexit
+import collections
+import contextlib
+import contextvars
+import copy
+import functools
+import hashlib
+import inspect
+import itertools
 import json
 import logging
+import math
+import os
+import queue
+import random
+import re
+import threading
+import time
+import warnings
+import weakref
+import zlib
 from requests.structures import CaseInsensitiveDict
 from http import HTTPStatus
-from datetime import datetime
-from urllib.parse import urlencode
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import urlencode, urlsplit
+from .cache import (
+    DAY,
+    HISTORY_TTL,
+    CachePolicy,
+    MemoryCache,
+    NegativeCache,
+    add_range,
+    cache_key,
+    missing_ranges,
+)
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Logger setup
 logger = logging.getLogger(__name__)
@@ -27,14 +71,48 @@ log_file_handler.setFormatter(
     logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
 )
 
+# Set when the file log is written from a background thread
+log_queue_listener = None
+
+
+def _stop_log_queue_listener():
+    global log_queue_listener
+
+    if log_queue_listener is not None:
+        log_queue_listener.stop()
+        log_queue_listener = None
+
+
+atexit.register(_stop_log_queue_listener)
+
 # Global config
 HEADERS = None
 BASE_URL = None
 PARALLEL_REQUESTS = 5
 MAX_RETRIES = 5
-RETRY_DELAY = 10
+RETRY_DELAY = 1
+RETRY_MAX_DELAY = 60
 TIMEOUT = 10
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 0
+KEEPALIVE_TIMEOUT = 30
+RATE_LIMIT_PACING = True
+RATE_LIMIT_SAFETY = 0.9  # Fraction of the advertised rate limit we aim for
+ADAPTIVE_CONCURRENCY = False
 EXCEPTION_LOG_LEVEL = logging.ERROR
+COALESCE_REQUESTS = False
+COMPRESSION = True
+CACHE = None
+CACHE_POLICY = CachePolicy()
+CACHE_HISTORY = True
+STALE_WHILE_REVALIDATE = (
+    0  # Seconds after expiry a cached response is served while refreshed
+)
+STALE_IF_ERROR = 0  # Seconds after expiry a cached response is served if the API fails
+HISTORY_SETTLE_DAYS = 3  # Days after which time series values don't change anymore
+REFERENTIAL_STORE = None
+NEGATIVE_CACHE = None
+LOG_BODY_LIMIT = 1000  # Max number of characters of a request/response body logged
 QUOTA_WARNING = [100, 1000, 10000, 100000]
 
 
@@ -44,13 +122,41 @@ def setup(
     base_url="https://customer.api.soundcharts.com",
     parallel_requests=5,
     max_retries=5,
-    retry_delay=10,
+    retry_delay=1,
     timeout=10,
     console_log_level=logging.WARNING,
     file_log_level=logging.WARNING,
     exception_log_level=logging.ERROR,
+    connection_limit=100,
+    connection_limit_per_host=0,
+    keepalive_timeout=30,
+    rate_limit_pacing=True,
+    adaptive_concurrency=False,
+    parallel_requests_floor=1,
+    parallel_requests_ceiling=50,
+    retry_max_delay=60,
+    retry_budget=0.2,
+    json_decoder=None,
+    log_body_limit=1000,
+    file_log_queue=False,
+    coalesce_requests=False,
+    compression=True,
+    cache=None,
+    cache_ttls=None,
+    cache_history=True,
+    history_settle_days=3,
+    referential_snapshot=None,
+    referential_refresh=DAY,
+    negative_cache=None,
+    stale_while_revalidate=0,
+    stale_if_error=0,
 ):
     global HEADERS, BASE_URL, PARALLEL_REQUESTS, MAX_RETRIES, RETRY_DELAY, TIMEOUT, EXCEPTION_LOG_LEVEL
+    global CONNECTION_LIMIT, CONNECTION_LIMIT_PER_HOST, KEEPALIVE_TIMEOUT, RATE_LIMIT_PACING
+    global ADAPTIVE_CONCURRENCY, RETRY_MAX_DELAY, JSON_DECODER
+    global LOG_BODY_LIMIT, log_queue_listener, COALESCE_REQUESTS, COMPRESSION
+    global CACHE, CACHE_POLICY, CACHE_HISTORY, HISTORY_SETTLE_DAYS, REFERENTIAL_STORE
+    global NEGATIVE_CACHE, STALE_WHILE_REVALIDATE, STALE_IF_ERROR
 
     HEADERS = CaseInsensitiveDict()
     HEADERS["x-app-id"] = app_id
@@ -60,16 +166,770 @@ def setup(
     PARALLEL_REQUESTS = parallel_requests
     MAX_RETRIES = max_retries
     RETRY_DELAY = retry_delay
+    RETRY_MAX_DELAY = retry_max_delay
     TIMEOUT = timeout
     EXCEPTION_LOG_LEVEL = exception_log_level
+    CONNECTION_LIMIT = connection_limit
+    CONNECTION_LIMIT_PER_HOST = connection_limit_per_host
+    KEEPALIVE_TIMEOUT = keepalive_timeout
+    RATE_LIMIT_PACING = rate_limit_pacing
+    ADAPTIVE_CONCURRENCY = adaptive_concurrency
+    LIMITER.set_limit(parallel_requests)
+    RATE_LIMITER.reset()
+    RETRY_BUDGET.configure(retry_budget)
+    JSON_DECODER = _get_json_decoder(json_decoder)
+    LOG_BODY_LIMIT = log_body_limit
+    COALESCE_REQUESTS = coalesce_requests
+    COMPRESSION = compression
+    HEADERS["Accept-Encoding"] = ACCEPT_ENCODING if compression else "identity"
+    if cache is True:
+        cache = MemoryCache()
+    CACHE = cache if cache is not False else None
+    CACHE_POLICY = CachePolicy(cache_ttls)
+    if negative_cache is True:
+        negative_cache = NegativeCache()
+    NEGATIVE_CACHE = negative_cache if negative_cache is not False else None
+    CACHE_HISTORY = cache_history
+    STALE_WHILE_REVALIDATE = stale_while_revalidate
+    STALE_IF_ERROR = stale_if_error
+    HISTORY_SETTLE_DAYS = history_settle_days
+    CONCURRENCY.configure(
+        parallel_requests, parallel_requests_floor, parallel_requests_ceiling
+    )
 
     logger.handlers.clear()
+    _stop_log_queue_listener()
+
+    # Let records below every handler level be dropped before being formatted
+    logger.setLevel(min(console_log_level, file_log_level))
 
     console_handler.setLevel(console_log_level)
     logger.addHandler(console_handler)
 
     log_file_handler.setLevel(file_log_level)
-    logger.addHandler(log_file_handler)
+    if file_log_queue:
+        # Write the file from a background thread rather than the event loop
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(file_log_level)
+        logger.addHandler(queue_handler)
+        log_queue_listener = QueueListener(
+            log_queue, log_file_handler, respect_handler_level=True
+        )
+        log_queue_listener.start()
+    else:
+        logger.addHandler(log_file_handler)
+
+    if REFERENTIAL_STORE is not None:
+        REFERENTIAL_STORE.stop()
+    if isinstance(referential_snapshot, (str, os.PathLike)):
+        from .referential import ReferentialStore
+
+        referential_snapshot = ReferentialStore(
+            referential_snapshot, referential_refresh
+        )
+    REFERENTIAL_STORE = referential_snapshot
+    if REFERENTIAL_STORE is not None:
+        REFERENTIAL_STORE.open()
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of requests in flight across the whole client.
+    Every HTTP attempt holds a slot for the duration of the call, whether it comes
+    from a paginator or a single call. Requests waiting for a slot are served in
+    FIFO order. Not thread-safe: use it from one event loop at a time.
+    """
+
+    def __init__(self, limit):
+        self.limit = max(1, int(limit))
+        self.in_flight = 0
+        self._waiters = collections.deque()
+
+    @property
+    def queued(self):
+        """Number of requests waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def set_limit(self, limit):
+        self.limit = max(1, int(limit))
+        self._wake()
+
+    async def acquire(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted right before the cancellation
+                self.release()
+            elif waiter in self._waiters:
+                # Otherwise _wake() already dropped it
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def __repr__(self):
+        return (
+            f"ConcurrencyLimiter(limit={self.limit}, in_flight={self.in_flight}, "
+            f"queued={self.queued})"
+        )
+
+
+LIMITER = ConcurrencyLimiter(PARALLEL_REQUESTS)
+
+
+class RateLimiter:
+    """
+    Token bucket pacing request issue times to stay just under the API rate limit.
+    The refill rate is recalibrated from the x-ratelimit-remaining/x-ratelimit-reset
+    headers of every response: the calls left in the window are spread evenly over
+    the time left, scaled by RATE_LIMIT_SAFETY. Until a response carries these
+    headers, requests are not paced.
+    """
+
+    def __init__(self, safety=RATE_LIMIT_SAFETY, burst=1.0):
+        self.safety = safety
+        self.burst = burst  # Seconds worth of requests that may be issued at once
+        self.reset()
+
+    def reset(self):
+        self.rate = None  # Requests per second, None until calibrated
+        self.tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @property
+    def capacity(self):
+        return max(1.0, self.rate * self.burst) if self.rate else 1.0
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def update(self, headers):
+        """
+        Recalibrate the refill rate from the rate limit headers of a response.
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            reset = float(reset)
+        except ValueError:
+            return
+        if reset > 1e9:
+            # Epoch timestamp rather than a delay
+            reset -= time.time()
+        reset = max(reset, 1.0)
+
+        now = time.monotonic()
+        self._refill(now)
+        if remaining <= 0:
+            self.pause(reset)
+            return
+        self.rate = self.safety * remaining / reset
+        self.tokens = min(self.tokens, self.capacity)
+
+    def pause(self, seconds):
+        """
+        Hold every request until the rate limit window resets.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            if not self.rate:
+                return
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def __repr__(self):
+        return f"RateLimiter(rate={self.rate}, tokens={round(self.tokens, 2)})"
+
+
+RATE_LIMITER = RateLimiter()
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller resizing the client-wide limiter from observed responses.
+    While latency stays within latency_tolerance times the best recent latency and
+    no errors come back, the window grows by one slot per window of successful
+    requests made while every slot is taken. A 429/502/503/504 or a timeout halves it, at most once per round trip
+    so that a burst of failures from the same window only counts once.
+    The window stays between floor and ceiling.
+    """
+
+    CONGESTION_STATUSES = {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+
+    def __init__(
+        self,
+        limiter,
+        window=5,
+        floor=1,
+        ceiling=50,
+        decrease=0.5,
+        latency_tolerance=2.0,
+    ):
+        self.limiter = limiter
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.configure(window, floor, ceiling)
+
+    def configure(self, window, floor, ceiling):
+        self.floor = max(1, int(floor))
+        self.ceiling = max(self.floor, int(ceiling))
+        self.window = float(min(max(window, self.floor), self.ceiling))
+        self.base_latency = None  # Best latency seen recently
+        self.latency = None  # Moving average of latencies
+        self._last_decrease = 0.0
+
+    def observe(self, status, latency):
+        """
+        Feed the outcome of one request. status is None for timeouts and
+        connection errors.
+        """
+        now = time.monotonic()
+        if status is None or status in self.CONGESTION_STATUSES:
+            # Ignore failures of requests sent before the last decrease
+            if now - self._last_decrease > (self.latency or 0.0):
+                self.window = max(self.floor, self.window * self.decrease)
+                self._last_decrease = now
+                logger.info(
+                    f"Congestion ({status}): parallel requests cut to {self.size}"
+                )
+            self._apply()
+            return
+
+        self.latency = (
+            latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+        )
+        if self.base_latency is None or latency < self.base_latency:
+            self.base_latency = latency
+        else:
+            # Let the baseline drift up slowly so that it follows the backend
+            self.base_latency += 0.01 * (latency - self.base_latency)
+
+        # Only grow a window that is in use: an idle limiter says nothing about
+        # how much more concurrency the backend can take
+        saturated = self.limiter.in_flight >= self.limiter.limit
+        if saturated and self.latency <= self.base_latency * self.latency_tolerance:
+            self.window = min(self.ceiling, self.window + 1 / self.window)
+        self._apply()
+
+    @property
+    def size(self):
+        return int(self.window)
+
+    def _apply(self):
+        if self.limiter.limit != self.size:
+            self.limiter.set_limit(self.size)
+
+    def __repr__(self):
+        return (
+            f"AdaptiveConcurrency(window={self.size}, floor={self.floor}, "
+            f"ceiling={self.ceiling})"
+        )
+
+
+CONCURRENCY = AdaptiveConcurrency(LIMITER, PARALLEL_REQUESTS)
+
+
+class RetryBudget:
+    """
+    Caps retries client-wide to a fraction of the requests sent over the last
+    `window` seconds, plus a small allowance, so that retries can't amplify an
+    outage. A ratio of None disables the budget.
+    """
+
+    def __init__(self, ratio=0.2, window=10.0, min_retries=10):
+        self.window = window
+        self.min_retries = min_retries
+        self.configure(ratio)
+
+    def configure(self, ratio):
+        self.ratio = ratio
+        self._requests = collections.deque()
+        self._retries = collections.deque()
+
+    def _trim(self, now):
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_request(self):
+        if self.ratio is not None:
+            self._requests.append(time.monotonic())
+
+    def try_spend(self):
+        """
+        Return True and account for a retry if the budget allows one.
+        """
+        if self.ratio is None:
+            return True
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+            return False
+        self._retries.append(now)
+        return True
+
+
+RETRY_BUDGET = RetryBudget()
+
+
+def _retry_delay(attempt, retry_delay, headers=None):
+    """
+    Seconds to wait before the next attempt: the server's Retry-After if given,
+    otherwise exponential backoff with full jitter, capped at RETRY_MAX_DELAY.
+    """
+    retry_after = headers.get("Retry-After") if headers else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                date = parsedate_to_datetime(retry_after)
+                return max(0.0, date.timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(RETRY_MAX_DELAY, retry_delay * 2 ** (attempt - 1)))
+
+
+def _get_json_decoder(name=None):
+    """
+    Return a function decoding JSON bytes. name is one of "orjson", "msgspec" or
+    "json", or None to pick the fastest installed backend.
+    """
+    if callable(name):
+        return name
+    if name in (None, "orjson"):
+        try:
+            import orjson
+
+            return orjson.loads
+        except ImportError:
+            if name is not None:
+                raise
+    if name in (None, "msgspec"):
+        try:
+            import msgspec
+
+            return msgspec.json.decode
+        except ImportError:
+            if name is not None:
+                raise
+    if name in (None, "json"):
+        return json.loads
+    raise ValueError(f"Unsupported JSON decoder: {name}")
+
+
+JSON_DECODER = _get_json_decoder()
+
+
+def _body_text(raw):
+    return raw.decode("utf-8", errors="replace")
+
+
+def _truncate(text):
+    if LOG_BODY_LIMIT is None or len(text) <= LOG_BODY_LIMIT:
+        return text
+    return f"{text[:LOG_BODY_LIMIT]}... ({len(text) - LOG_BODY_LIMIT} more characters)"
+
+
+# Content encodings we can decode, best first
+ACCEPT_ENCODING = ", ".join(
+    encoding
+    for encoding, available in (
+        ("zstd", zstandard is not None),
+        ("br", brotli is not None),
+        ("gzip", True),
+        ("deflate", True),
+    )
+    if available
+)
+
+
+def _decompressor(encoding):
+    """
+    Return a function decompressing a response body chunk by chunk (called with
+    None at the end to flush), or None if the body isn't compressed.
+    Stacked encodings (e.g. "gzip, br") are undone in reverse order. Unsupported
+    encodings raise aiohttp.ClientPayloadError, handled like other request errors.
+    """
+    encodings = [part.strip().lower() for part in (encoding or "").split(",")]
+    steps = [
+        _decoder(encoding)
+        for encoding in reversed(encodings)
+        if encoding not in ("", "identity")
+    ]
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+
+    def decompress(chunk):
+        data = chunk
+        for step in steps:
+            if chunk is None:
+                # Flush each step into the next one
+                data = (step(data) if data else b"") + step(None)
+            else:
+                data = step(data)
+        return data
+
+    return decompress
+
+
+def _decoder(encoding):
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # The zlib header is detected automatically for both formats
+        decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        return lambda chunk: (
+            decompressor.flush() if chunk is None else decompressor.decompress(chunk)
+        )
+    if encoding == "br" and brotli is not None:
+        decompressor = brotli.Decompressor()
+        decompress = getattr(decompressor, "process", None) or decompressor.decompress
+        return lambda chunk: b"" if chunk is None else decompress(chunk)
+    if encoding == "zstd" and zstandard is not None:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        return lambda chunk: b"" if chunk is None else decompressor.decompress(chunk)
+    raise aiohttp.ClientPayloadError(f"Unsupported content encoding: {encoding}")
+
+
+async def _read_body(response, session):
+    """
+    Read a response body, decompressing it as it streams in unless the session
+    already does. Return the body and the number of bytes received on the wire.
+    """
+    decompress = None
+    if not session.auto_decompress:
+        decompress = _decompressor(response.headers.get("Content-Encoding"))
+    if decompress is None:
+        raw = await response.read()
+        wire_bytes = int(response.headers.get("Content-Length") or len(raw))
+        return raw, wire_bytes
+
+    chunks = []
+    wire_bytes = 0
+    try:
+        async for chunk in response.content.iter_chunked(65536):
+            wire_bytes += len(chunk)
+            chunks.append(decompress(chunk))
+        chunks.append(decompress(None))
+    except aiohttp.ClientError:
+        raise
+    except Exception as e:
+        # zlib.error, brotli.error, zstandard.ZstdError...
+        raise aiohttp.ClientPayloadError(f"Could not decompress the body: {e}") from e
+    return b"".join(chunks), wire_bytes
+
+
+_ID_SEGMENT = re.compile(r"[0-9A-Z%:.,+ ]|^[0-9a-f]{32}$")
+
+
+def endpoint_family(endpoint):
+    """
+    Group endpoints by replacing identifiers in their path with placeholders,
+    e.g. "/api/v2.9/artist/<uuid>" -> "artist/{id}".
+    Identifiers are recognized heuristically (digits, capitals, encoded characters).
+    """
+    segments = urlsplit(endpoint).path.strip("/").split("/")
+    if segments[0] == "api":
+        segments = segments[1:]
+    if segments and re.fullmatch(r"v[0-9.]+", segments[0]):
+        segments = segments[1:]
+    family = []
+    for i, segment in enumerate(segments):
+        previous = family[-1] if family else None
+        if previous == "search":
+            segment = "{term}"
+        elif i >= 2 and family[-2] == "by-platform":
+            segment = "{id}"
+        elif _ID_SEGMENT.search(segment):
+            segment = "{id}"
+        family.append(segment)
+    return "/".join(family)
+
+
+class TransferStats:
+    """
+    Bytes received per endpoint family: on the wire (possibly compressed) and
+    after decompression. Responses revalidated with 304 Not Modified count the
+    cached body, which wasn't transferred.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._stats = collections.defaultdict(
+            lambda: {
+                "responses": 0,
+                "not_modified": 0,
+                "wire_bytes": 0,
+                "body_bytes": 0,
+            }
+        )
+
+    def record(self, endpoint, wire_bytes, body_bytes, not_modified=False):
+        stats = self._stats[endpoint_family(endpoint)]
+        stats["responses"] += 1
+        stats["not_modified"] += not_modified
+        stats["wire_bytes"] += wire_bytes
+        stats["body_bytes"] += body_bytes
+
+    def snapshot(self):
+        """
+        Return a copy of the statistics, by endpoint family and in total.
+        """
+        families = {family: dict(stats) for family, stats in self._stats.items()}
+        total = {"responses": 0, "not_modified": 0, "wire_bytes": 0, "body_bytes": 0}
+        for stats in families.values():
+            for key, value in stats.items():
+                total[key] += value
+        total["saved_bytes"] = total["body_bytes"] - total["wire_bytes"]
+        for stats in families.values():
+            stats["saved_bytes"] = stats["body_bytes"] - stats["wire_bytes"]
+        return {"total": total, "endpoints": families}
+
+
+TRANSFER_STATS = TransferStats()
+
+
+class CacheStats:
+    """
+    Cache outcomes per endpoint family: fresh hits, misses, stale responses served,
+    revalidations (304 Not Modified), known misses (negative cache) and requests
+    coalesced with an identical one in flight, with the API calls avoided and the
+    response bytes that didn't have to be transferred.
+    """
+
+    COUNTERS = (
+        "hits",
+        "misses",
+        "stale",
+        "revalidated",
+        "known_misses",
+        "coalesced",
+        "calls_avoided",
+        "saved_bytes",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the statistics, and the eviction count of the cache.
+        """
+        self._stats = collections.defaultdict(lambda: dict.fromkeys(self.COUNTERS, 0))
+        if CACHE is not None:
+            CACHE.evictions = 0
+
+    def record(self, endpoint, outcome, saved_bytes=0, call_avoided=False):
+        stats = self._stats[endpoint_family(endpoint)]
+        stats[outcome] += 1
+        stats["saved_bytes"] += saved_bytes
+        stats["calls_avoided"] += call_avoided
+
+    def snapshot(self):
+        """
+        Return a copy of the statistics, by endpoint family and in total, with the
+        hit ratio (fresh hits over hits and misses), and the current number of
+        entries, size and evictions of the cache.
+        """
+        families = {family: dict(stats) for family, stats in self._stats.items()}
+        total = dict.fromkeys(self.COUNTERS, 0)
+        for stats in families.values():
+            for key, value in stats.items():
+                total[key] += value
+        for stats in [total, *families.values()]:
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = stats["hits"] / lookups if lookups else None
+        cache = None
+        if CACHE is not None:
+            cache = {
+                "entries": len(CACHE),
+                "size": CACHE.size,
+                "max_bytes": CACHE.max_bytes,
+                "evictions": getattr(CACHE, "evictions", 0),
+            }
+        return {"total": total, "endpoints": families, "cache": cache}
+
+
+CACHE_STATS = CacheStats()
+
+
+def _validators(headers):
+    """
+    Return the validators of a response, used to revalidate it once expired, or None.
+    """
+    validators = {}
+    if "ETag" in headers:
+        validators["etag"] = headers["ETag"]
+    if "Last-Modified" in headers:
+        validators["last_modified"] = headers["Last-Modified"]
+    return validators or None
+
+
+# Pooled sessions, one per event loop, created lazily by the first request
+_SESSIONS = weakref.WeakKeyDictionary()
+
+
+def get_session():
+    """
+    Return the pooled session of the running event loop, creating it if needed.
+    Must be called from a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+            # Bodies are decompressed by _read_body, which also counts wire bytes
+            auto_decompress=False,
+        )
+        _SESSIONS[loop] = session
+    return session
+
+
+async def close_session():
+    """
+    Close the pooled session of the running event loop and release its connections.
+    """
+    session = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+# In-flight GET requests by URL, one table per event loop
+_IN_FLIGHT = weakref.WeakKeyDictionary()
+
+
+async def _coalesce(key, send):
+    """
+    Single-flight: callers asking for the same key while a request is in flight
+    share its result instead of sending their own. Each caller gets its own copy
+    of the result when it was shared, so they can modify it freely.
+    """
+    in_flight = _IN_FLIGHT.setdefault(asyncio.get_running_loop(), {})
+    entry = in_flight.get(key)
+    if entry is None:
+        task = asyncio.ensure_future(send())
+        entry = in_flight[key] = [task, 0]
+        task.add_done_callback(lambda _: in_flight.pop(key, None))
+    else:
+        logger.debug("Joining in-flight request: %s", key)
+    entry[1] += 1
+
+    # A cancelled caller must not cancel the request shared with the others
+    result = await asyncio.shield(entry[0])
+    return copy.deepcopy(result) if entry[1] > 1 else result
+
+
+def _normalize_params(params):
+    """
+    Drop empty parameters and format booleans the way the API expects them.
+    """
+    normalized = {}
+    for k, v in (params or {}).items():
+        if not v:
+            continue
+        if isinstance(v, bool):
+            normalized[k] = "true" if v else "false"
+            continue
+        normalized[k] = v
+    return normalized
+
+
+# False while the referential store fetches its datasets from the API
+_USE_REFERENTIAL_STORE = contextvars.ContextVar("use_referential_store", default=True)
+
+
+def _referential_response(endpoint, params):
+    """
+    Return the response of a referential request from the referential store
+    (see referential.ReferentialStore), or None if it isn't stored.
+    """
+    if REFERENTIAL_STORE is None or not _USE_REFERENTIAL_STORE.get():
+        return None
+    response = REFERENTIAL_STORE.response(endpoint, params)
+    if response is not None:
+        logger.debug("Referential store hit: %s", endpoint)
+        CACHE_STATS.record(endpoint, "hits", call_avoided=True)
+    return response
+
+
+# Background refreshes of stale cache entries, by cache key
+_REFRESHING = {}
+
+
+def _refresh_in_background(key, send):
+    """
+    Refresh a stale cache entry in a background task, unless it is already being
+    refreshed. Must be called from a coroutine.
+    """
+    if key in _REFRESHING:
+        return
+
+    async def refresh():
+        try:
+            await send()
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            _REFRESHING.pop(key, None)
+
+    _REFRESHING[key] = asyncio.get_running_loop().create_task(refresh())
 
 
 async def request_wrapper_async(
@@ -87,6 +947,10 @@ async def request_wrapper_async(
     """
     global HEADERS, BASE_URL, MAX_RETRIES, RETRY_DELAY, TIMEOUT
 
+    if _CAPTURED_PAGINATION.get() is not None:
+        # Called by a method that isn't paginated, see _paginated_request
+        return None
+
     if max_retries is None:
         max_retries = MAX_RETRIES
     if retry_delay is None:
@@ -96,17 +960,7 @@ async def request_wrapper_async(
 
     url = f"{BASE_URL}{endpoint}"
     headers = dict(HEADERS or {})
-
-    raw_params = params or {}
-    params = {}
-
-    for k, v in (raw_params or {}).items():
-        if not v:
-            continue
-        if isinstance(v, bool):
-            params[k] = "true" if v else "false"
-            continue
-        params[k] = v
+    params = _normalize_params(params)
 
     if body:
         headers["Content-Type"] = "application/json"
@@ -118,67 +972,204 @@ async def request_wrapper_async(
     else:
         raise ValueError(f"Unsupported HTTP method: {method}")
 
+    if method_name == "GET":
+        stored = _referential_response(endpoint, params)
+        if stored is not None:
+            return stored
+
     full_url = f"{url}?{urlencode(params, doseq=True)}" if params else url
 
-    owns_session = False
+    # Lookups by identifier known to return 404
+    not_found_key = None
+    if (
+        NEGATIVE_CACHE is not None
+        and method_name == "GET"
+        and NEGATIVE_CACHE.applies(endpoint_family(endpoint))
+    ):
+        not_found_key = cache_key(method_name, endpoint, params)
+        if not_found_key in NEGATIVE_CACHE:
+            CACHE_STATS.record(endpoint, "known_misses", call_avoided=True)
+            log_msg = f"404 Not Found (known miss): {full_url}"
+            logger.warning(log_msg)
+            if logging.WARNING >= EXCEPTION_LOG_LEVEL:
+                raise RuntimeError(log_msg)
+            return None
+
+    key, ttl, stale = None, 0, None
+    if CACHE is not None and method_name != "DELETE":
+        ttl = CACHE_POLICY.ttl(endpoint_family(endpoint))
+    if ttl:
+        key = cache_key(method_name, endpoint, params, body)
+        entry = CACHE.get(key)
+        if entry is not None and entry.is_fresh():
+            logger.debug("Cache hit: %s", key)
+            CACHE_STATS.record(endpoint, "hits", len(entry.value), call_avoided=True)
+            return JSON_DECODER(entry.value)
+        stale = entry
+        if entry is not None and entry.validators:
+            # Expired: ask the API to only send it again if it changed
+            if "etag" in entry.validators:
+                headers["If-None-Match"] = entry.validators["etag"]
+            if "last_modified" in entry.validators:
+                headers["If-Modified-Since"] = entry.validators["last_modified"]
+
+    send = functools.partial(
+        _send_request,
+        method_name,
+        url,
+        full_url,
+        params,
+        headers,
+        body,
+        session,
+        max_retries,
+        retry_delay,
+        timeout,
+        key,
+        ttl,
+        not_found_key,
+        stale,
+    )
+    if stale is not None and time.time() < stale.expires_at + STALE_WHILE_REVALIDATE:
+        logger.debug("Stale cache hit, refreshing in the background: %s", key)
+        CACHE_STATS.record(endpoint, "stale", len(stale.value))
+        _refresh_in_background(key, send)
+        return JSON_DECODER(stale.value)
+    coalesce = COALESCE_REQUESTS and method_name == "GET"
+    if coalesce and full_url in _IN_FLIGHT.get(asyncio.get_running_loop(), ()):
+        # Joins the identical request in flight, see _coalesce
+        CACHE_STATS.record(endpoint, "coalesced", call_avoided=True)
+    elif key is not None:
+        CACHE_STATS.record(endpoint, "misses")
+    if coalesce:
+        return await _coalesce(full_url, send)
+    return await send()
+
+
+async def _send_request(
+    method_name,
+    url,
+    full_url,
+    params,
+    headers,
+    body,
+    session,
+    max_retries,
+    retry_delay,
+    timeout,
+    cache_key=None,
+    cache_ttl=0,
+    not_found_key=None,
+    stale=None,
+):
+    """
+    Send one request, retrying it according to the response.
+    Successful responses are stored in the cache under cache_key if given,
+    404 responses in the negative cache under not_found_key if given.
+    stale is the expired cache entry of the request, if any: on 304 Not Modified
+    its body is returned and cached again, and it is served instead of failing
+    on 5xx, 429 or network errors during STALE_IF_ERROR seconds after its expiry.
+    """
     if session is None:
-        timeout_cfg = aiohttp.ClientTimeout(total=timeout)
-        session = aiohttp.ClientSession(timeout=timeout_cfg)
-        owns_session = True
+        session = get_session()
+    timeout_cfg = aiohttp.ClientTimeout(total=timeout)
+
+    serve_stale = stale is not None and time.time() < stale.expires_at + STALE_IF_ERROR
 
     # Otherwise max_retries=0 will result in no attempts
     attempts = max_retries + 1
-    try:
-        for attempt in range(1, attempts + 1):
-            try:
-                logger.info(
-                    f"Attempt {attempt}/{attempts}: {method_name} {full_url}"
-                )
-                logger.debug(f"Headers: {headers}")
+    RETRY_BUDGET.record_request()
+    for attempt in range(1, attempts + 1):
+        try:
+            logger.info(
+                "Attempt %s/%s: %s %s", attempt, attempts, method_name, full_url
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Headers: %s", headers)
                 if params:
-                    logger.debug(f"Params: {params}")
+                    logger.debug("Params: %s", params)
                 if body:
-                    logger.debug(f"Body: {json.dumps(body)}")
+                    logger.debug("Body: %s", _truncate(json.dumps(body)))
 
+            sleep_delay = None
+            async with LIMITER:
+                if RATE_LIMIT_PACING:
+                    await RATE_LIMITER.acquire()
+                sent_at = time.monotonic()
                 async with session.request(
                     method_name,
                     url,
                     params=params,
                     headers=headers,
                     data=json.dumps(body) if body else None,
+                    timeout=timeout_cfg,
                 ) as response:
                     status = response.status
-                    text = await response.text()
+                    raw, wire_bytes = await _read_body(response, session)
+                    not_modified = (
+                        status == HTTPStatus.NOT_MODIFIED and stale is not None
+                    )
+                    if not_modified:
+                        raw = stale.value
+                        CACHE_STATS.record(url, "revalidated", len(raw))
+                    TRANSFER_STATS.record(url, wire_bytes, len(raw), not_modified)
+
+                    if ADAPTIVE_CONCURRENCY:
+                        CONCURRENCY.observe(status, time.monotonic() - sent_at)
 
-                    logger.debug(f"Response Status: {status}")
-                    logger.debug(f"Response Body: {text}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Response Status: %s", status)
+                        logger.debug("Response Body: %s", _truncate(_body_text(raw)))
+
+                    if RATE_LIMIT_PACING:
+                        RATE_LIMITER.update(response.headers)
 
                     # Remaining requests
                     quota = response.headers.get("x-quota-remaining")
                     if quota in QUOTA_WARNING:
                         logger.warning(f"{quota} calls remaining.")
 
-                    if status == HTTPStatus.OK:
-                        try:
-                            return await response.json()
-                        except Exception:
-                            return text
+                    # Decode the body once, for both results and error messages
+                    try:
+                        data = JSON_DECODER(raw) if raw.strip() else None
+                    except Exception:
+                        data = _body_text(raw)
+
+                    if status == HTTPStatus.OK or not_modified:
+                        if cache_key is not None and isinstance(data, (dict, list)):
+                            validators = _validators(response.headers)
+                            if not_modified:
+                                validators = {**stale.validators, **(validators or {})}
+                            CACHE.set(cache_key, raw, cache_ttl, validators)
+                        return data
+
+                    if serve_stale and (
+                        status >= HTTPStatus.INTERNAL_SERVER_ERROR
+                        or status == HTTPStatus.TOO_MANY_REQUESTS
+                    ):
+                        logger.warning(
+                            f"{status} Error when calling {full_url} — "
+                            f"Serving the stale cached response"
+                        )
+                        CACHE_STATS.record(url, "stale")
+                        return JSON_DECODER(stale.value)
 
                     # Extract error message
                     try:
-                        error_data = await response.json()
                         message = (
-                            error_data.get("errors", [{}])[0].get("message")
-                            or error_data.get("message")
-                            or text
+                            data.get("errors", [{}])[0].get("message")
+                            or data.get("message")
+                            or _body_text(raw)
                         )
                     except Exception:
-                        message = text
+                        message = _body_text(raw)
 
                     # 404
                     if status == HTTPStatus.NOT_FOUND:
                         log_msg = f"404 Not Found: {full_url} — {message}"
                         logger.warning(log_msg)
+                        if not_found_key is not None:
+                            NEGATIVE_CACHE.add(not_found_key)
                         if logging.WARNING >= EXCEPTION_LOG_LEVEL:
                             raise RuntimeError(log_msg)
                         return None
@@ -191,11 +1182,19 @@ async def request_wrapper_async(
                     }:
                         if attempt >= attempts:
                             break
+                        if not RETRY_BUDGET.try_spend():
+                            logger.warning(
+                                f"{status} Error: {message} when calling {full_url} — "
+                                f"Retry budget exhausted, not retrying"
+                            )
+                            break
+                        sleep_delay = _retry_delay(
+                            attempt, retry_delay, response.headers
+                        )
                         logger.warning(
                             f"{status} Error: {message} when calling {full_url} — "
-                            f"Retrying in {retry_delay} seconds ({attempt}/{attempts})"
+                            f"Retrying in {sleep_delay:.1f} seconds ({attempt}/{attempts})"
                         )
-                        await asyncio.sleep(retry_delay)
 
                     # Auth / rate limit
                     elif status in {
@@ -210,13 +1209,15 @@ async def request_wrapper_async(
                             if attempt >= attempts:
                                 break
                             sleep_delay = (
-                                int(response.headers.get("x-ratelimit-reset", 0)) + 1
+                                _retry_delay(attempt, 0, response.headers)
+                                if "Retry-After" in response.headers
+                                else int(response.headers.get("x-ratelimit-reset", 0))
+                                + 1
                             )
                             logger.warning(
                                 f"{status} Error: {message} when calling {full_url} — "
                                 f"Retrying in {sleep_delay} seconds ({attempt + 1}/{attempts})"
                             )
-                            await asyncio.sleep(sleep_delay)
                         else:
                             log_msg = (
                                 f"{status} Error: {message} when calling {full_url}"
@@ -233,27 +1234,45 @@ async def request_wrapper_async(
                         logger.error(log_msg)
                         if logging.ERROR >= EXCEPTION_LOG_LEVEL:
                             raise RuntimeError(f"HTTP {status}: {message}")
+                        if attempt >= attempts or not RETRY_BUDGET.try_spend():
+                            break
+                        sleep_delay = _retry_delay(
+                            attempt, retry_delay, response.headers
+                        )
 
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                logger.exception(f"Request exception: {e}")
-                if attempt >= attempts:
-                    raise RuntimeError(
-                        f"Maximum retry attempts reached when calling {full_url}."
-                    ) from e
-                await asyncio.sleep(retry_delay)
-
-        final_msg = (
-            f"Unhandled error or maximum retries exceeded when calling {full_url}."
-        )
-        logger.error(final_msg)
-        if logging.ERROR >= EXCEPTION_LOG_LEVEL:
-            raise RuntimeError(final_msg)
-
-        return None
-
-    finally:
-        if owns_session and session is not None:
-            await session.close()
+            # Wait outside the limiter so a backing-off request doesn't hold a slot
+            if sleep_delay:
+                await asyncio.sleep(sleep_delay)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.exception(f"Request exception: {e}")
+            if ADAPTIVE_CONCURRENCY:
+                CONCURRENCY.observe(None, None)
+            if serve_stale:
+                logger.warning(f"Serving the stale cached response for {full_url}")
+                CACHE_STATS.record(url, "stale")
+                return JSON_DECODER(stale.value)
+            if attempt >= attempts:
+                raise RuntimeError(
+                    f"Maximum retry attempts reached when calling {full_url}."
+                ) from e
+            if not RETRY_BUDGET.try_spend():
+                raise RuntimeError(
+                    f"Retry budget exhausted when calling {full_url}."
+                ) from e
+            await asyncio.sleep(_retry_delay(attempt, retry_delay))
+
+    if serve_stale:
+        logger.warning(f"Serving the stale cached response for {full_url}")
+        CACHE_STATS.record(url, "stale")
+        return JSON_DECODER(stale.value)
+
+    final_msg = f"Unhandled error or maximum retries exceeded when calling {full_url}."
+    logger.error(final_msg)
+    if logging.ERROR >= EXCEPTION_LOG_LEVEL:
+        raise RuntimeError(final_msg)
+
+    return None
 
 
 async def request_looper_async(
@@ -261,8 +1280,30 @@ async def request_looper_async(
     params=None,
     body=None,
     print_progress=False,
-    max_parallel_requests=5,
+    prefetch=None,
+    stop_when=None,
+    max_parallel_requests=None,
 ):
+    """
+    Async paginator. Pages are fetched concurrently, within the client-wide limit
+    set by parallel_requests, and their items gathered in offset order, so the
+    server's sort order is kept. At most prefetch pages are fetched ahead, by
+    default twice the parallel_requests limit, pages arriving early waiting for the
+    ones before them.
+    Once stop_when, if given, returns True for a page, the pages after it are
+    cancelled and the items so far returned. By default, the function set with
+    stop_pagination_when is used.
+    max_parallel_requests is deprecated and ignored: the client-wide limiter
+    bounds concurrency.
+    """
+    if max_parallel_requests is not None:
+        warnings.warn(
+            "max_parallel_requests is ignored, concurrency is bounded client-wide "
+            "by parallel_requests. Use prefetch to bound the pages fetched ahead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
     def print_percentage(progress, total):
         if total > 0:
             percentage = min(round(progress * 100 / total, 2), 100)
@@ -270,152 +1311,696 @@ async def request_looper_async(
             if progress >= total:
                 print()
 
-    params = params.copy() if params else {}
-    results = {}
+    if _capture_pagination(endpoint, params, body):
+        return None
+
+    if not body:
+        stored = _referential_response(endpoint, _normalize_params(params))
+        if stored is not None:
+            return stored
+
+    if stop_when is None:
+        stop_when = _STOP_WHEN.get()
+    limit = (params or {}).get("limit")
+    offset = max(int((params or {}).get("offset") or 0), 0)
+    results = None
+    stopped = False
+    items = []
+    last_page_block = {}
+
+    pages = request_pages_async(endpoint, params, body, prefetch)
+    try:
+        async for page in pages:
+            if results is None:
+                results = page
+                if "items" not in page:
+                    return results
+                first_page = page.get("page") or {}
+                total_server = first_page.get("total", len(page["items"]))
+                total_effective = total_server - offset
+                if limit is not None:
+                    total_effective = min(total_effective, int(limit))
+
+            items.extend(page["items"])
+            last_page_block = page.get("page") or last_page_block
+
+            if print_progress:
+                print_percentage(min(len(items), total_effective), total_effective)
+
+            if stop_when is not None and stop_when(page):
+                stopped = True
+                break
+    finally:
+        await pages.aclose()
+
+    if results is None:
+        return None
+
+    results["items"] = items
+
+    # Pagination = last page we fetched
+    results["page"] = dict(last_page_block)
+    results["page"]["total"] = total_server  # always true total
+
+    # Are we fetching the full dataset or a limited slice?
+    if not stopped and (limit is None or offset + int(limit) >= total_server):
+        # only overwrite next if we truly reached the server end
+        results["page"]["next"] = None
+
+    results["page"].setdefault("offset", offset)
+    results["page"].setdefault("limit", len(items))
+
+    return results
+
 
-    # Limit / offset
+async def request_pages_async(
+    endpoint, params=None, body=None, prefetch=None, stop_when=None
+):
+    """
+    Async generator of the pages of a paginated endpoint, in offset order.
+    Pages are yielded as soon as they arrive, while at most prefetch pages after
+    them are being fetched, so memory doesn't grow with the total. The items of
+    the last page are truncated to the limit parameter, if any. Pages that can't
+    be fetched are skipped, as with request_looper_async.
+    Once the generator is closed, or stop_when returns True for a page (which is
+    still yielded), the pages being fetched or waiting to be are cancelled.
+    :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+    :param stop_when: Optional function called with each page, returning True to stop after it.
+    """
+    params = params.copy() if params else {}
     raw_limit = params.pop("limit", None)
-    if raw_limit is not None:
-        limit = int(raw_limit)
-        params["limit"] = min(limit, 100)  # page size
-    else:
-        limit = None
+    limit = int(raw_limit) if raw_limit is not None else None
+    page_size = min(limit, 100) if limit else 100
+    offset = max(int(params.get("offset") or 0), 0)
+    params.update(offset=offset, limit=page_size)
+    session = get_session()
+
+    async def fetch_page(off):
+        return await request_wrapper_async(
+            endpoint, {**params, "offset": off}, body=body, session=session
+        )
+
+    remaining = limit
+
+    def truncate(page):
+        nonlocal remaining
+        if remaining is not None:
+            page["items"] = page["items"][:remaining]
+            remaining -= len(page["items"])
+        return page
+
+    first = await fetch_page(offset)
+    if not first:
+        return
+    if "items" not in first:
+        yield first
+        return
+    total = (first.get("page") or {}).get("total", len(first["items"]))
+    end = total if limit is None else min(total, offset + limit)
+    stop = stop_when is not None and stop_when(first)
+    yield truncate(first)
+    if stop:
+        return
+
+    pages = _fetch_pages(
+        fetch_page, range(offset + page_size, end, page_size), prefetch
+    )
+    try:
+        async for _, page in pages:
+            if remaining == 0:
+                return
+            if page and "items" in page:
+                stop = stop_when is not None and stop_when(page)
+                yield truncate(page)
+                if stop:
+                    return
+    finally:
+        await pages.aclose()
+
 
-    offset = int(params.get("offset") or 0)
-    params["offset"] = max(offset, 0)
+async def _fetch_pages(fetch_page, offsets, prefetch=None):
+    """
+    Async generator of the (offset, page) pairs of the given offsets, in order.
+    Pages are fetched concurrently, those arriving early waiting in a window of
+    prefetch pages, by default twice the parallel_requests limit so slow pages
+    don't stall the others. Pages still in the window are cancelled on close.
+    """
+    offsets = iter(offsets)
+    window = collections.deque()
+
+    def fill_window():
+        size = max(1, prefetch or 2 * LIMITER.limit)
+        for off in itertools.islice(offsets, max(0, size - len(window))):
+            window.append((off, asyncio.create_task(fetch_page(off))))
+
+    try:
+        fill_window()
+        while window:
+            off, task = window.popleft()
+            page = await task
+            fill_window()
+            yield off, page
+    finally:
+        for _, task in window:
+            task.cancel()
+
+
+# Checkpoint file format version, increased when the layout changes
+CHECKPOINT_FORMAT = 1
+
+
+async def request_crawl_async(
+    endpoint,
+    params=None,
+    body=None,
+    checkpoint="soundcharts_crawl.jsonl",
+    prefetch=None,
+):
+    """
+    Async paginator for long crawls of every page (limit=None) that can be resumed.
+    Each page is appended to a checkpoint file as soon as it arrives, after a header
+    with a fingerprint of the query (endpoint, parameters and body). If the file
+    was written by the same query, the crawl resumes from it: only the pages
+    missing from it are fetched. Once every page is fetched, the file is deleted
+    and the items are returned in offset order, like request_looper_async.
+    Otherwise, the pages fetched so far are returned and the file is kept.
+    :param checkpoint: Path of the checkpoint file.
+    :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+    """
+    params = {k: v for k, v in (params or {}).items() if k not in ("offset", "limit")}
+    page_size = 100
+    query = cache_key(
+        "POST" if body else "GET", endpoint, _normalize_params(params), body
+    )
+    fingerprint = hashlib.sha256(query.encode()).hexdigest()
+    checkpoint = os.fspath(checkpoint)
+    session = get_session()
 
-    timeout_cfg = aiohttp.ClientTimeout(total=TIMEOUT)
-    async with aiohttp.ClientSession(timeout=timeout_cfg) as session:
-        # First page
-        first_params = params.copy()
-        results = await request_wrapper_async(
+    async def fetch_page(off):
+        return await request_wrapper_async(
             endpoint,
-            first_params,
+            {**params, "offset": off, "limit": page_size},
             body=body,
             session=session,
         )
 
-        if not results or "items" not in results:
-            return results
+    header, pages = None, {}
+    try:
+        with open(checkpoint, "rb") as file:
+            header = json.loads(file.readline())
+            # End of the last complete line, where the next pages are appended
+            end = file.tell()
+            for line in file:
+                try:
+                    page = json.loads(line)
+                except ValueError:
+                    # Line cut short by an interruption
+                    continue
+                pages[page["offset"]] = page["items"]
+                if line.endswith(b"\n"):
+                    end = file.tell()
+        if os.path.getsize(checkpoint) > end:
+            os.truncate(checkpoint, end)
+    except FileNotFoundError:
+        pass
+    except ValueError:
+        logger.warning(f"Checkpoint {checkpoint} is unreadable, starting over.")
+        header = None
+    if not isinstance(header, dict):
+        header, pages = None, {}
+    elif (
+        header.get("format") != CHECKPOINT_FORMAT
+        or header.get("fingerprint") != fingerprint
+    ):
+        logger.warning(f"Checkpoint {checkpoint} is for another query, starting over.")
+        header, pages = None, {}
+
+    if header is None:
+        first = await fetch_page(0)
+        if not first or "items" not in first:
+            return first
+        header = {
+            "format": CHECKPOINT_FORMAT,
+            "fingerprint": fingerprint,
+            "total": (first.get("page") or {}).get("total", len(first["items"])),
+            "response": {k: v for k, v in first.items() if k != "items"},
+        }
+        pages = {0: first["items"]}
+        # Never leave a checkpoint without its header
+        temporary = f"{checkpoint}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(json.dumps(header) + "\n")
+            file.write(json.dumps({"offset": 0, "items": first["items"]}) + "\n")
+        os.replace(temporary, checkpoint)
+    else:
+        logger.info(f"Resuming {endpoint} from {checkpoint}: {len(pages)} pages done.")
+
+    total = header["total"]
+    missing = [off for off in range(0, total, page_size) if off not in pages]
+    with open(checkpoint, "a", encoding="utf-8") as file:
+        fetched = _fetch_pages(fetch_page, missing, prefetch)
+        try:
+            async for off, page in fetched:
+                if not page or "items" not in page:
+                    continue
+                file.write(json.dumps({"offset": off, "items": page["items"]}) + "\n")
+                file.flush()
+                pages[off] = page["items"]
+        finally:
+            await fetched.aclose()
+
+    complete = len(pages) >= len(range(0, total, page_size))
+    if complete:
+        os.remove(checkpoint)
+    else:
+        logger.warning(
+            f"Crawl of {endpoint} incomplete, run it again to resume from {checkpoint}."
+        )
+
+    results = dict(header["response"])
+    results["items"] = [item for off in sorted(pages) for item in pages[off]]
+    results["page"] = dict(results.get("page") or {})
+    results["page"].update(offset=0, limit=len(results["items"]), total=total)
+    if complete:
+        results["page"]["next"] = None
+    return results
 
-        items = list(results.get("items", []))
 
-        first_page = results.get("page", {}) or {}
-        total_server = first_page.get("total", len(items))
-        total_effective = (
-            min(total_server, limit) if limit is not None else total_server
+async def request_items_async(
+    endpoint, params=None, body=None, prefetch=None, stop_when=None
+):
+    """
+    Async generator of the items of a paginated endpoint, see request_pages_async.
+    """
+    pages = request_pages_async(endpoint, params, body, prefetch, stop_when)
+    try:
+        async for page in pages:
+            for item in page.get("items") or []:
+                yield item
+    finally:
+        await pages.aclose()
+
+
+# Default stop_when of request_looper_async, see stop_pagination_when
+_STOP_WHEN = contextvars.ContextVar("stop_when", default=None)
+
+
+@contextlib.contextmanager
+def stop_pagination_when(stop_when):
+    """
+    Context manager making the paginated methods called in its block stop after
+    the first page for which stop_when(page) returns True, cancelling the pages
+    after it. E.g. for endpoints sorted by date, descending:
+    with stop_pagination_when(lambda page: page["items"][-1]["date"] < watermark):
+    """
+    token = _STOP_WHEN.set(stop_when)
+    try:
+        yield
+    finally:
+        _STOP_WHEN.reset(token)
+
+
+async def _with_stop_when(coro, stop_when):
+    token = _STOP_WHEN.set(stop_when)
+    try:
+        return await coro
+    finally:
+        _STOP_WHEN.reset(token)
+
+
+# Request of the paginated method being called by _paginated_request, if any
+_CAPTURED_PAGINATION = contextvars.ContextVar("captured_pagination", default=None)
+
+
+def _capture_pagination(endpoint, params=None, body=None):
+    """
+    Record the request of a paginator instead of sending it, if a paginated method
+    is being called by _paginated_request.
+    :return: True if the request was recorded.
+    """
+    captured = _CAPTURED_PAGINATION.get()
+    if captured is None:
+        return False
+    captured.append((endpoint, params, body))
+    return True
+
+
+def _paginated_request(method, args, kwargs):
+    """
+    Call a sync paginated method, e.g. Artist.get_artists, without sending its
+    request, and return the (endpoint, params, body) it paginates.
+    """
+    captured = []
+    token = _CAPTURED_PAGINATION.set(captured)
+    try:
+        result = method(*args, **kwargs)
+    finally:
+        _CAPTURED_PAGINATION.reset(token)
+    if inspect.isawaitable(result):
+        result.close()
+        raise TypeError(
+            f"{method.__qualname__} is async, iterate it with the async client."
         )
+    if len(captured) != 1:
+        raise TypeError(f"{method.__qualname__} is not a paginated method.")
+    return captured[0]
+
+
+async def _paginated_request_async(method, args, kwargs):
+    """
+    Async version of _paginated_request, for the methods of the async classes.
+    """
+    captured = []
+    token = _CAPTURED_PAGINATION.set(captured)
+    try:
+        await method(*args, **kwargs)
+    finally:
+        _CAPTURED_PAGINATION.reset(token)
+    if len(captured) != 1:
+        raise TypeError(f"{method.__qualname__} is not a paginated method.")
+    return captured[0]
 
-        if print_progress:
-            print_percentage(len(items), total_effective)
 
-        # Are we fetching the full dataset or a limited slice?
-        fetched_all = (limit is None) or (limit >= total_server)
+async def aiter_pages(method, *args, prefetch=None, stop_when=None, **kwargs):
+    """
+    Async generator of the pages returned by a paginated method of the async
+    client, e.g. aiter_pages(ArtistAsync.get_artists, limit=None),
+    yielded as they arrive instead of being gathered in one response.
+    Pages come in the server's order, results aren't sorted by the method.
+    :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+    :param stop_when: Optional function called with each page, returning True to stop after it.
+    """
+    endpoint, params, body = await _paginated_request_async(method, args, kwargs)
+    pages = request_pages_async(endpoint, params, body, prefetch, stop_when)
+    try:
+        async for page in pages:
+            yield page
+    finally:
+        await pages.aclose()
 
-        if len(items) >= total_effective:
-            if limit is not None:
-                items = items[:limit]
-            results["items"] = items
 
-            # pagination from first page (also "last fetched" here)
-            results["page"] = dict(first_page) if first_page else {}
-            results["page"]["total"] = total_server
+async def aiter_items(method, *args, prefetch=None, stop_when=None, **kwargs):
+    """
+    Async generator of the items returned by a paginated method of the async
+    client, see aiter_pages.
+    """
+    endpoint, params, body = await _paginated_request_async(method, args, kwargs)
+    items = request_items_async(endpoint, params, body, prefetch, stop_when)
+    try:
+        async for item in items:
+            yield item
+    finally:
+        await items.aclose()
 
-            if fetched_all:
-                results["page"]["next"] = None  # only if we truly fetched all
 
-            return results
+def _check_crawl_arguments(method, args, kwargs):
+    """
+    Raise ValueError if a call to crawl passes a limit or an offset, which it
+    can't honour since it fetches every page.
+    """
+    try:
+        arguments = inspect.signature(method).bind_partial(*args, **kwargs).arguments
+    except (TypeError, ValueError):
+        # Reported by the call itself
+        return
+    if arguments.get("limit") is not None or arguments.get("offset"):
+        raise ValueError(
+            f"{method.__qualname__} is crawled from the first page to the last, "
+            "don't pass a limit or an offset."
+        )
 
-        page_size = params.get("limit", 100)
-        extra_offsets = list(range(offset + page_size, total_effective, page_size))
-        if not extra_offsets:
-            if limit is not None:
-                items = items[:limit]
-            results["items"] = items
 
-            results["page"] = dict(first_page) if first_page else {}
-            results["page"]["total"] = total_server
-            if fetched_all:
-                results["page"]["next"] = None
+async def crawl_async(method, *args, checkpoint, prefetch=None, **kwargs):
+    """
+    Call a paginated method of the async client for every page (limit=None),
+    saving the pages to a checkpoint file so an interrupted crawl resumes where it
+    stopped, see request_crawl_async. Raises ValueError if a limit or an offset
+    is passed.
+    """
+    _check_crawl_arguments(method, args, kwargs)
+    endpoint, params, body = await _paginated_request_async(method, args, kwargs)
+    return await request_crawl_async(endpoint, params, body, checkpoint, prefetch)
 
-            return results
 
-        sem = asyncio.Semaphore(max_parallel_requests)
+# Background event loop running the coroutines of the sync API
+_LOOP = None
+_LOOP_THREAD = None
+_LOOP_LOCK = threading.Lock()
 
-        async def fetch_page(off):
-            page_params = params.copy()
-            page_params["offset"] = off
-            page_params["limit"] = page_size
-            async with sem:
-                resp = await request_wrapper_async(
-                    endpoint,
-                    page_params,
-                    body=body,
-                    session=session,
-                )
-            return off, resp
 
-        tasks = [asyncio.create_task(fetch_page(o)) for o in extra_offsets]
+def _get_loop():
+    """
+    Return the background event loop, starting its thread on first use.
+    The loop lives until stop_loop() is called, so its pooled session and
+    connections are reused across sync calls.
+    """
+    global _LOOP, _LOOP_THREAD
 
-        last_page_offset = offset
-        last_page_block = first_page if first_page else {}
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_THREAD = threading.Thread(
+                target=_LOOP.run_forever,
+                name="soundcharts-loop",
+                daemon=True,
+            )
+            _LOOP_THREAD.start()
+        return _LOOP
 
-        for task in asyncio.as_completed(tasks):
-            off, response = await task
-            if not response or "items" not in response:
-                continue
 
-            page_items = response.get("items") or []
-            if page_items:
-                items.extend(page_items)
+def stop_loop():
+    """
+    Close the pooled session of the background event loop, then stop the loop
+    and join its thread. The next sync call starts a new one.
+    """
+    global _LOOP, _LOOP_THREAD
 
-            page_block = response.get("page") or {}
-            if off >= last_page_offset and page_block:
-                last_page_offset = off
-                last_page_block = page_block
+    with _LOOP_LOCK:
+        loop, thread = _LOOP, _LOOP_THREAD
+        _LOOP = _LOOP_THREAD = None
 
-            if print_progress:
-                progress = min(len(items), total_effective)
-                print_percentage(progress, total_effective)
+    if loop is None or loop.is_closed():
+        return
+    if threading.current_thread() is thread:
+        raise RuntimeError("stop_loop() cannot be called from the loop thread.")
 
-            if len(items) >= total_effective:
-                break
+    if REFERENTIAL_STORE is not None:
+        REFERENTIAL_STORE.stop()
 
-        if limit is not None:
-            items = items[:limit]
+    asyncio.run_coroutine_threadsafe(close_session(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
 
-        results["items"] = items
 
-        # Pagination = last logical page we fetched
-        results["page"] = dict(last_page_block) if last_page_block else {}
-        results["page"]["total"] = total_server  # always true total
+atexit.register(stop_loop)
 
-        if fetched_all:
-            # only overwrite next if we truly reached the server end
-            results["page"]["next"] = None
 
-        results["page"].setdefault("offset", last_page_offset)
-        results["page"].setdefault("limit", page_size)
+async def request_series_async(endpoint, params=None, date_key="date"):
+    """
+    Async paginator for daily time series (startDate/endDate parameters).
+    Values older than HISTORY_SETTLE_DAYS don't change anymore, so they are kept
+    in the cache per endpoint and parameters, sorted and deduplicated by date.
+    Only the date ranges not stored yet are fetched, usually the last few days,
+    and merged with the stored values into the usual response shape.
+    Without a cache, a start date or with cache_history=False, this is
+    request_looper_async.
+    """
+    if _capture_pagination(endpoint, params):
+        return None
+
+    params = dict(params or {})
+    start_date = params.get("startDate")
+    if CACHE is None or not CACHE_HISTORY or not start_date or _STOP_WHEN.get():
+        return await request_looper_async(endpoint, params)
+
+    today = datetime.now(timezone.utc).date()
+    start = date.fromisoformat(str(start_date)[:10])
+    end = min(date.fromisoformat(str(params.get("endDate") or today)[:10]), today)
+    settled = today - timedelta(days=HISTORY_SETTLE_DAYS)
+
+    series_params = {
+        k: v for k, v in params.items() if k not in ("startDate", "endDate") and v
+    }
+    key = "series " + cache_key("GET", endpoint, series_params)
+    entry = CACHE.get(key)
+    if entry is not None:
+        series = JSON_DECODER(entry.value)
+    else:
+        series = {"covered": [], "items": {}, "response": None}
+    covered = [
+        (date.fromisoformat(first), date.fromisoformat(last))
+        for first, last in series["covered"]
+    ]
+
+    gaps = missing_ranges(covered, start, end)
+    CACHE_STATS.record(endpoint, "misses" if gaps else "hits", call_avoided=not gaps)
+    results = await asyncio.gather(
+        *(
+            request_looper_async(
+                endpoint,
+                {**params, "startDate": first.isoformat(), "endDate": last.isoformat()},
+            )
+            for first, last in gaps
+        )
+    )
+    for (first, last), result in zip(gaps, results):
+        if not result or "items" not in result:
+            # Don't return a partial series
+            return result
+        if any(date_key not in item for item in result["items"]):
+            logger.debug("Series %s: items without %s, not stored", key, date_key)
+            return await request_looper_async(endpoint, params)
+        for item in result["items"]:
+            series["items"][item[date_key]] = item
+        series["response"] = {k: v for k, v in result.items() if k != "items"}
+        if first <= settled:
+            covered = add_range(covered, first, min(last, settled))
+
+    if gaps:
+        logger.debug("Series %s: fetched %s, stored %s", key, gaps, covered)
+        series["covered"] = [
+            (first.isoformat(), last.isoformat()) for first, last in covered
+        ]
+        CACHE.set(key, json.dumps(series).encode(), HISTORY_TTL)
+
+    first, last = start.isoformat(), end.isoformat()
+    items = [
+        item
+        for item_date, item in sorted(series["items"].items())
+        if first <= item_date[:10] <= last
+    ]
+    response = dict(series["response"] or {})
+    response["items"] = items
+    response["page"] = dict(response.get("page") or {})
+    response["page"].update(offset=0, total=len(items), next=None)
+    return response
+
+
+async def request_sharded_async(
+    endpoint, params=None, date_key="airedAt", window_pages=20
+):
+    """
+    Async paginator for long date ranges (startDate/endDate parameters) of deep
+    endpoints, e.g. radio spins. Rather than paginating the whole range to deep
+    offsets, the range is split into date windows of at most window_pages pages,
+    sized from the total of their first page: windows with too many items are
+    split again, down to single days. The first page of each window is kept, the
+    next ones are paginated in parallel, and the items of every window merged
+    without duplicates, sorted by date_key descending if every item has one.
+    Without both dates, with a limit or an offset, this is request_looper_async.
+    """
+    if _capture_pagination(endpoint, params):
+        return None
 
-        return results
+    params = dict(params or {})
+    start_date, end_date = params.get("startDate"), params.get("endDate")
+    if (
+        not start_date
+        or not end_date
+        or params.get("limit") is not None
+        or params.get("offset")
+        or _STOP_WHEN.get()
+    ):
+        return await request_looper_async(endpoint, params)
+    start = date.fromisoformat(str(start_date)[:10])
+    end = date.fromisoformat(str(end_date)[:10])
+    page_size = 100
+    max_items = window_pages * page_size
+
+    def window_params(first, last):
+        return {**params, "startDate": first.isoformat(), "endDate": last.isoformat()}
+
+    async def first_page(first, last):
+        return await request_wrapper_async(
+            endpoint, {**window_params(first, last), "offset": 0, "limit": page_size}
+        )
+
+    def total(page):
+        return (page.get("page") or {}).get("total", len(page["items"]))
+
+    async def plan(first, last, page):
+        # (window, first page) pairs of [first, last], windows holding at most
+        # max_items items if possible
+        days = (last - first).days + 1
+        if not page or "items" not in page or total(page) <= max_items or days == 1:
+            return [((first, last), page)]
+        parts = min(days, math.ceil(total(page) / max_items))
+        bounds = [first + timedelta(days=days * i // parts) for i in range(parts + 1)]
+        windows = [
+            (bounds[i], bounds[i + 1] - timedelta(days=1)) for i in range(parts - 1)
+        ]
+        windows.append((bounds[parts - 1], last))
+        pages = await asyncio.gather(*(first_page(*window) for window in windows))
+        plans = await asyncio.gather(
+            *(plan(*window, page) for window, page in zip(windows, pages))
+        )
+        return [window for windows in plans for window in windows]
+
+    async def fetch(window, page):
+        # The first page is reused, only the next ones are fetched
+        if not page or "items" not in page or len(page["items"]) >= total(page):
+            return page
+        rest = await request_looper_async(
+            endpoint, {**window_params(*window), "offset": page_size, "limit": None}
+        )
+        if not rest or "items" not in rest:
+            return rest
+        return {**page, "items": page["items"] + rest["items"]}
+
+    windows = await plan(start, end, await first_page(start, end))
+    if len(windows) > 1:
+        logger.debug("Sharding %s into %s date windows", endpoint, len(windows))
+
+    results = await asyncio.gather(*(fetch(*window) for window in windows))
+    for result in results:
+        if not result or "items" not in result:
+            # Don't return a partial range
+            return result
+
+    # Latest window first, as the API sorts by date descending
+    items, seen = [], set()
+    for result in reversed(results):
+        for item in result["items"]:
+            key = json.dumps(item, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                items.append(item)
+    if all(date_key in item for item in items):
+        items.sort(key=lambda item: item[date_key], reverse=True)
+
+    response = {k: v for k, v in results[-1].items() if k != "items"}
+    response["items"] = items
+    response["page"] = dict(response.get("page") or {})
+    response["page"].update(offset=0, limit=len(items), total=len(items), next=None)
+    return response
 
 
 def _run_blocking(coro):
     """
     Run an async coroutine in a blocking way.
     Used to provide a sync public API on top of async internals.
+    The coroutine runs on the background event loop, which also makes the sync
+    API usable from threads that already run a loop (e.g. Jupyter).
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        # No running loop -> normal script -> safe
-        return asyncio.run(coro)
-    else:
-        # Already in an event loop -> calling sync API from async code is a bad idea
+    loop = _get_loop()
+    if threading.current_thread() is _LOOP_THREAD:
+        coro.close()
         raise RuntimeError(
-            "Soundcharts sync API called from an async context. "
+            "Soundcharts sync API called from its own event loop. "
             "Use the async client instead."
         )
+    stop_when = _STOP_WHEN.get()
+    if stop_when is not None:
+        # Context variables don't follow the coroutine to the loop thread
+        coro = _with_stop_when(coro, stop_when)
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. KeyboardInterrupt: don't leave the request running in the background
+        future.cancel()
+        raise
 
 
 def request_wrapper(
@@ -430,6 +2015,8 @@ def request_wrapper(
     """
     Public sync API: wraps the async paginator.
     """
+    if _CAPTURED_PAGINATION.get() is not None:
+        return None
     return _run_blocking(
         request_wrapper_async(
             endpoint,
@@ -452,6 +2039,8 @@ def request_looper(
     """
     Public sync API: wraps the async paginator.
     """
+    if _capture_pagination(endpoint, params, body):
+        return None
     return _run_blocking(
         request_looper_async(
             endpoint,
@@ -462,6 +2051,100 @@ def request_looper(
     )
 
 
+def request_series(endpoint, params=None, date_key="date"):
+    """
+    Public sync API: wraps the async time series paginator.
+    """
+    if _capture_pagination(endpoint, params):
+        return None
+    return _run_blocking(request_series_async(endpoint, params, date_key=date_key))
+
+
+def request_sharded(endpoint, params=None, date_key="airedAt", window_pages=20):
+    """
+    Public sync API: wraps the async date window paginator.
+    """
+    if _capture_pagination(endpoint, params):
+        return None
+    return _run_blocking(
+        request_sharded_async(endpoint, params, date_key, window_pages)
+    )
+
+
+# Returned by _anext once the async generator is exhausted
+_EXHAUSTED = object()
+
+
+async def _anext(agen):
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+def _iterate_blocking(agen):
+    """
+    Iterate over an async generator in a blocking way, on the background event loop.
+    """
+    try:
+        while True:
+            value = _run_blocking(_anext(agen))
+            if value is _EXHAUSTED:
+                return
+            yield value
+    finally:
+        _run_blocking(agen.aclose())
+
+
+def request_crawl(
+    endpoint,
+    params=None,
+    body=None,
+    checkpoint="soundcharts_crawl.jsonl",
+    prefetch=None,
+):
+    """
+    Public sync API: wraps the async resumable paginator.
+    """
+    return _run_blocking(
+        request_crawl_async(endpoint, params, body, checkpoint, prefetch)
+    )
+
+
+def crawl(method, *args, checkpoint, prefetch=None, **kwargs):
+    """
+    Public sync API: call a paginated method for every page (limit=None), e.g.
+    crawl(Artist.get_artists, checkpoint="artists.jsonl"), saving the
+    pages to a checkpoint file so an interrupted crawl resumes where it stopped,
+    see request_crawl_async. Raises ValueError if a limit or an offset is passed.
+    """
+    _check_crawl_arguments(method, args, kwargs)
+    endpoint, params, body = _paginated_request(method, args, kwargs)
+    return request_crawl(endpoint, params, body, checkpoint, prefetch)
+
+
+def iter_pages(method, *args, prefetch=None, stop_when=None, **kwargs):
+    """
+    Public sync API: generator of the pages returned by a paginated method, e.g.
+    iter_pages(Artist.get_artists, limit=None), see aiter_pages.
+    """
+    endpoint, params, body = _paginated_request(method, args, kwargs)
+    return _iterate_blocking(
+        request_pages_async(endpoint, params, body, prefetch, stop_when)
+    )
+
+
+def iter_items(method, *args, prefetch=None, stop_when=None, **kwargs):
+    """
+    Public sync API: generator of the items returned by a paginated method, see
+    aiter_pages.
+    """
+    endpoint, params, body = _paginated_request(method, args, kwargs)
+    return _iterate_blocking(
+        request_items_async(endpoint, params, body, prefetch, stop_when)
+    )
+
+
 def sort_items_by_date(result, reverse=False, key="date"):
 
     if result == None or len(result) == 0 or "items" not in result:
@@ -3,6 +3,10 @@ from .api_util import (
     request_looper,
     request_wrapper_async,
     request_looper_async,
+    request_sharded,
+    request_sharded_async,
+    request_series,
+    request_series_async,
     sort_items_by_date,
     list_join,
 )
@@ -229,7 +233,7 @@ class Artist:
 
         endpoint = f"/api/v2/artist/{artist_uuid}/audience/{platform}"
         params = {"startDate": start_date, "endDate": end_date}
-        result = request_looper(endpoint, params)
+        result = request_series(endpoint, params)
         return {} if result is None or len(result) == 0 else sort_items_by_date(result)
 
     @staticmethod
@@ -266,7 +270,7 @@ class Artist:
         """
         endpoint = f"/api/v2/artist/{artist_uuid}/streaming/{platform}/listening"
         params = {"startDate": start_date, "endDate": end_date}
-        result = request_looper(endpoint, params)
+        result = request_series(endpoint, params)
         return {} if result is None or len(result) == 0 else sort_items_by_date(result)
 
     @staticmethod
@@ -316,7 +320,7 @@ class Artist:
         """
         endpoint = f"/api/v2/artist/{artist_uuid}/popularity/{platform}"
         params = {"startDate": start_date, "endDate": end_date}
-        result = request_looper(endpoint, params)
+        result = request_series(endpoint, params)
         return {} if result is None else sort_items_by_date(result)
 
     @staticmethod
@@ -573,7 +577,7 @@ class Artist:
         :param start_date: Optional period start date (format YYYY-MM-DD).
         :param end_date: Optional period end date (format YYYY-MM-DD), leave empty for the latest results.
         :param offset: Pagination offset.
-        :param limit: Number of results to retrieve. None: no limit. Default: 100.
+        :param limit: Number of results to retrieve. None: no limit. Default: 100. With both dates and no limit, the range is fetched in parallel date windows.
         :return: JSON response or an empty dictionary.
         """
 
@@ -586,7 +590,7 @@ class Artist:
             "offset": offset,
             "limit": limit,
         }
-        result = request_looper(endpoint, params)
+        result = request_sharded(endpoint, params)
         return result if result is not None else {}
 
     @staticmethod
@@ -906,7 +910,7 @@ class ArtistAsync:
 
         endpoint = f"/api/v2/artist/{artist_uuid}/audience/{platform}"
         params = {"startDate": start_date, "endDate": end_date}
-        result = await request_looper_async(endpoint, params)
+        result = await request_series_async(endpoint, params)
         return {} if result is None or len(result) == 0 else sort_items_by_date(result)
 
     @staticmethod
@@ -943,7 +947,7 @@ class ArtistAsync:
         """
         endpoint = f"/api/v2/artist/{artist_uuid}/streaming/{platform}/listening"
         params = {"startDate": start_date, "endDate": end_date}
-        result = await request_looper_async(endpoint, params)
+        result = await request_series_async(endpoint, params)
         return {} if result is None or len(result) == 0 else sort_items_by_date(result)
 
     @staticmethod
@@ -997,7 +1001,7 @@ class ArtistAsync:
         """
         endpoint = f"/api/v2/artist/{artist_uuid}/popularity/{platform}"
         params = {"startDate": start_date, "endDate": end_date}
-        result = await request_looper_async(endpoint, params)
+        result = await request_series_async(endpoint, params)
         return {} if result is None else sort_items_by_date(result)
 
     @staticmethod
@@ -1254,7 +1258,7 @@ class ArtistAsync:
         :param start_date: Optional period start date (format YYYY-MM-DD).
         :param end_date: Optional period end date (format YYYY-MM-DD), leave empty for the latest results.
         :param offset: Pagination offset.
-        :param limit: Number of results to retrieve. None: no limit. Default: 100.
+        :param limit: Number of results to retrieve. None: no limit. Default: 100. With both dates and no limit, the range is fetched in parallel date windows.
         :return: JSON response or an empty dictionary.
         """
 
@@ -1267,7 +1271,7 @@ class ArtistAsync:
             "offset": offset,
             "limit": limit,
         }
-        result = await request_looper_async(endpoint, params)
+        result = await request_sharded_async(endpoint, params)
         return result if result is not None else {}
 
     @staticmethod
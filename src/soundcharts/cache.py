@@ -0,0 +1,605 @@
+import atexit
+import collections
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import timedelta
+from urllib.parse import urlencode
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+# For responses that never change
+FOREVER = 100 * 365 * DAY
+# Entries living at least this long (FOREVER, also once imported from a snapshot)
+# are evicted from a SQLiteCache apart from the others, see forever_max_bytes
+PINNED_TTL = FOREVER // 2
+# Settled time series history doesn't change, but stays evictable
+HISTORY_TTL = 365 * DAY
+
+# Time to live in seconds by endpoint family (see api_util.endpoint_family).
+# Patterns are regular expressions, the first one matching wins.
+DEFAULT_TTLS = [
+    # Rankings and tracklistings of a past date never change
+    (r"^chart/[a-z]+/.+/ranking/\{id\}$|^playlist/\{id\}/tracks/\{id\}$", FOREVER),
+    # Latest chart rankings change with each chart update
+    (r"/ranking/latest$", 10 * MINUTE),
+    # Referential data: platforms, genres, countries, label types...
+    (
+        r"(^|/)referential/|/platforms(/|$)|^(artist|song)/genres$|^radio/countries$",
+        7 * DAY,
+    ),
+    # Lists of available dates, polled often but revalidated cheaply
+    (r"/available-[a-z-]+$", 10 * MINUTE),
+    # Metadata: "artist/{id}", "song/by-isrc/{id}", "album/by-platform/spotify/{id}"...
+    (r"^[a-z/-]+/(\{id\}|by-[a-z-]+(/[a-z0-9-]+)?/\{id\})$", 6 * HOUR),
+]
+
+
+class CachePolicy:
+    """
+    Decides how long responses are cached, by endpoint family.
+    Endpoints matching no rule are not cached.
+    """
+
+    def __init__(self, ttls=None, default_ttl=0):
+        """
+        :param ttls: Dictionary of endpoint family patterns to TTLs in seconds, checked before the default rules. A TTL of 0 disables caching.
+        :param default_ttl: TTL for endpoints matching no rule. Default: 0.
+        """
+        rules = list((ttls or {}).items()) + DEFAULT_TTLS
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in rules]
+        self.default_ttl = default_ttl
+        self._ttls = {}
+
+    def ttl(self, family):
+        ttl = self._ttls.get(family)
+        if ttl is None:
+            ttl = next(
+                (ttl for pattern, ttl in self.rules if pattern.search(family)),
+                self.default_ttl,
+            )
+            self._ttls[family] = ttl
+        return ttl
+
+
+def cache_key(method, endpoint, params=None, body=None):
+    """
+    Build the cache key of a request: method, endpoint, sorted parameters and a
+    hash of the JSON body.
+    """
+    key = f"{method} {endpoint}"
+    if params:
+        key += "?" + urlencode(sorted(params.items()), doseq=True)
+    if body:
+        encoded = json.dumps(body, sort_keys=True, separators=(",", ":"))
+        key += " " + hashlib.sha256(encoded.encode()).hexdigest()[:32]
+    return key
+
+
+class CacheEntry(
+    collections.namedtuple(
+        "CacheEntry",
+        ["value", "stored_at", "expires_at", "validators"],
+        defaults=(None,),
+    )
+):
+    """
+    A cached response body with the times (epoch seconds) it was stored and expires,
+    and the validators of the response ({"etag": ..., "last_modified": ...}) if any.
+    """
+
+    __slots__ = ()
+
+    def is_fresh(self):
+        return time.time() < self.expires_at
+
+
+def missing_ranges(covered, start, end):
+    """
+    Return the (start, end) date ranges of [start, end] not in covered, a sorted
+    list of non-overlapping (start, end) date ranges. Bounds are inclusive.
+    """
+    missing = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = covered_end + timedelta(days=1)
+        if cursor > end:
+            return missing
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def add_range(covered, start, end):
+    """
+    Return covered with the date range [start, end] added, overlapping and
+    adjacent ranges merged.
+    """
+    merged = []
+    for covered_start, covered_end in sorted(covered + [(start, end)]):
+        if merged and covered_start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+        else:
+            merged.append((covered_start, covered_end))
+    return merged
+
+
+class MemoryCache:
+    """
+    In-memory cache of response bodies, evicting the least recently used entries
+    once their total size exceeds max_bytes. Expired entries are kept until evicted
+    or overwritten, get() returns them and callers check is_fresh().
+    Thread-safe.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, ttl, validators=None):
+        now = time.time()
+        entry = CacheEntry(value, now, now + ttl, validators)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.value)
+            if len(value) > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.value)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= len(entry.value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def items(self):
+        """
+        Return the (key, entry) pairs of the cache, least recently used first.
+        """
+        with self._lock:
+            return list(self._entries.items())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"MemoryCache(entries={len(self)}, size={self.size}, max_bytes={self.max_bytes})"
+
+
+class SQLiteCache:
+    """
+    On-disk cache of response bodies in a SQLite database, shared by every process
+    and run using the same file. The database is in WAL mode, so readers don't
+    block writers. Once the stored values exceed max_bytes, the least recently
+    used entries are evicted. Entries cached FOREVER (e.g. dated rankings) don't
+    count towards max_bytes: they are evicted the same way once they exceed
+    forever_max_bytes, so that other responses can't push them out. Values can be
+    stored zlib-compressed, sizes count the stored bytes.
+    Same interface as MemoryCache. Thread-safe, one connection per thread.
+    """
+
+    # Check the total size every this many writes
+    EVICTION_INTERVAL = 100
+    # Don't record an access more often than this many seconds per entry
+    ACCESS_RESOLUTION = 60
+
+    def __init__(
+        self,
+        path="soundcharts_cache.sqlite",
+        max_bytes=1024**3,
+        compress=False,
+        forever_max_bytes=1024**3,
+    ):
+        """
+        :param path: Path of the database file, created if needed.
+        :param max_bytes: Maximum total size of the stored values, except the ones cached forever. None: no limit. Default: 1 GB.
+        :param compress: Store values zlib-compressed. Default: False.
+        :param forever_max_bytes: Maximum total size of the values cached forever. None: no limit. Default: 1 GB.
+        """
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.forever_max_bytes = forever_max_bytes
+        self.compress = compress
+        self.evictions = 0
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, compressed INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, validators TEXT)"
+            )
+            columns = [row[1] for row in db.execute("PRAGMA table_info(entries)")]
+            if "validators" not in columns:
+                # Database created by a previous version
+                db.execute("ALTER TABLE entries ADD COLUMN validators TEXT")
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+            )
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key):
+        db = self._connection()
+        row = db.execute(
+            "SELECT value, compressed, stored_at, expires_at, accessed_at, validators "
+            "FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        value, compressed, stored_at, expires_at, accessed_at, validators = row
+        now = time.time()
+        if now - accessed_at > self.ACCESS_RESOLUTION:
+            with db:
+                db.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        if compressed:
+            value = zlib.decompress(value)
+        if validators is not None:
+            validators = json.loads(validators)
+        return CacheEntry(bytes(value), stored_at, expires_at, validators)
+
+    def set(self, key, value, ttl, validators=None):
+        now = time.time()
+        if self.compress:
+            value = zlib.compress(value)
+        size = len(value)
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, value, compressed, size, stored_at, expires_at, accessed_at, "
+                "validators) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    value,
+                    int(self.compress),
+                    size,
+                    now,
+                    now + ttl,
+                    now,
+                    json.dumps(validators) if validators else None,
+                ),
+            )
+        self._writes += 1
+        if self._writes % self.EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Delete the least recently used entries until the entries cached forever fit
+        forever_max_bytes and the others fit max_bytes.
+        """
+        for max_bytes, pinned in (
+            (self.max_bytes, "<"),
+            (self.forever_max_bytes, ">="),
+        ):
+            if max_bytes is None:
+                continue
+            where = f"expires_at - stored_at {pinned} ?"
+            with self._connection() as db:
+                size = db.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE {where}",
+                    (PINNED_TTL,),
+                ).fetchone()[0]
+                excess = size - max_bytes
+                if excess <= 0:
+                    continue
+                # Running total of the sizes, oldest accesses first
+                deleted = db.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM (SELECT key, size, SUM(size) OVER "
+                    f"(ORDER BY accessed_at, key) AS total FROM entries WHERE {where}) "
+                    "WHERE total - size < ?)",
+                    (PINNED_TTL, excess),
+                )
+                self.evictions += deleted.rowcount
+
+    def delete(self, key):
+        with self._connection() as db:
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connection() as db:
+            db.execute("DELETE FROM entries")
+
+    def items(self):
+        """
+        Iterate over the (key, entry) pairs of the cache, least recently used first.
+        """
+        rows = self._connection().execute(
+            "SELECT key, value, compressed, stored_at, expires_at, validators "
+            "FROM entries ORDER BY accessed_at"
+        )
+        for key, value, compressed, stored_at, expires_at, validators in rows:
+            if compressed:
+                value = zlib.decompress(value)
+            if validators is not None:
+                validators = json.loads(validators)
+            yield key, CacheEntry(bytes(value), stored_at, expires_at, validators)
+
+    @property
+    def size(self):
+        return (
+            self._connection()
+            .execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+            .fetchone()[0]
+        )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __repr__(self):
+        return f"SQLiteCache(path={self.path!r}, entries={len(self)}, size={self.size})"
+
+
+# Endpoint families of lookups by identifier, whose 404 responses are remembered
+NOT_FOUND_FAMILIES = r"/by-[a-z-]+(/[a-z0-9-]+)?/\{id\}$"
+
+
+class BloomFilter:
+    """
+    Compact set of keys in a fixed-size bit array. Membership tests have no false
+    negatives, and false positives with probability error_rate once it holds
+    capacity keys.
+    """
+
+    def __init__(self, capacity, error_rate, bits=None):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8) if bits is None else bits
+
+    def _positions(self, key):
+        # Double hashing: positions a + i * b, from a single 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little") | 1
+        return [(a + i * b) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class NegativeCache:
+    """
+    Remembers the lookups by identifier (ISRC, UPC, platform id...) that returned
+    404 Not Found, so the same unknown identifiers aren't requested again for ttl
+    seconds.
+    Keys are kept in two Bloom filters, each covering half the ttl: a miss is
+    remembered between ttl / 2 and ttl seconds. Once a filter holds capacity keys,
+    a lookup that was never a miss is taken for one with probability error_rate.
+    If path is given, the filters are loaded from it and saved to it by save(),
+    when the client is closed and when the process exits.
+    Thread-safe.
+    """
+
+    # File format version, increased when the layout changes
+    FORMAT = 1
+
+    def __init__(
+        self,
+        path=None,
+        ttl=7 * DAY,
+        capacity=1_000_000,
+        error_rate=0.0001,
+        families=NOT_FOUND_FAMILIES,
+    ):
+        """
+        :param path: Path of the file the filters are saved to. None: not saved. Default: None.
+        :param ttl: Time in seconds after which misses are requested again. Default: 7 days.
+        :param capacity: Expected number of misses per half ttl. Default: 1,000,000.
+        :param error_rate: Probability of taking an unknown key for a miss at capacity. Default: 0.0001.
+        :param families: Regular expression of the endpoint families whose misses are remembered. Default: lookups by identifier.
+        """
+        self.path = os.fspath(path) if path is not None else None
+        self.ttl = ttl
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.families = re.compile(families)
+        self._applies = {}
+        self._lock = threading.Lock()
+        self._reset(time.time())
+        if self.path is not None:
+            self.load()
+            atexit.register(self.save)
+
+    def _reset(self, now):
+        self.current = BloomFilter(self.capacity, self.error_rate)
+        self.previous = BloomFilter(self.capacity, self.error_rate)
+        self.started_at = now
+
+    def _rotate(self):
+        now = time.time()
+        age = now - self.started_at
+        if age >= self.ttl:
+            self._reset(now)
+        elif age >= self.ttl / 2:
+            self.previous = self.current
+            self.current = BloomFilter(self.capacity, self.error_rate)
+            self.started_at = now
+
+    def applies(self, family):
+        applies = self._applies.get(family)
+        if applies is None:
+            applies = self._applies[family] = bool(self.families.search(family))
+        return applies
+
+    def add(self, key):
+        with self._lock:
+            self._rotate()
+            self.current.add(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._rotate()
+            return key in self.current or key in self.previous
+
+    def clear(self):
+        with self._lock:
+            self._reset(time.time())
+
+    def load(self):
+        """
+        Load the filters from path.
+        :return: True if they were loaded, False if the file is missing or was saved with other settings.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                header, data = file.read().split(b"\n", 1)
+        except FileNotFoundError:
+            return False
+        header = json.loads(header)
+        with self._lock:
+            if header != self._header(header["started_at"]):
+                return False
+            bits = zlib.decompress(data)
+            half = len(bits) // 2
+            self.current = BloomFilter(
+                self.capacity, self.error_rate, bytearray(bits[:half])
+            )
+            self.previous = BloomFilter(
+                self.capacity, self.error_rate, bytearray(bits[half:])
+            )
+            self.started_at = header["started_at"]
+            self._rotate()
+        return True
+
+    def _header(self, started_at):
+        return {
+            "format": self.FORMAT,
+            "size": self.current.size,
+            "hashes": self.current.hashes,
+            "ttl": self.ttl,
+            "started_at": started_at,
+        }
+
+    def save(self):
+        """
+        Write the filters to path, atomically.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            header = json.dumps(self._header(self.started_at)).encode()
+            data = zlib.compress(bytes(self.current.bits + self.previous.bits))
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(header + b"\n" + data)
+        os.replace(temporary, self.path)
+
+    def __repr__(self):
+        return f"NegativeCache(path={self.path!r}, ttl={self.ttl}, capacity={self.capacity})"
+
+
+# Cache snapshot file format version, increased when the layout changes
+SNAPSHOT_FORMAT = 1
+
+
+def export_snapshot(cache, path):
+    """
+    Write the entries of a cache (MemoryCache, SQLiteCache...) to a gzip-compressed
+    snapshot file, to warm up the cache of another process or machine with
+    import_snapshot. The file is replaced atomically.
+    Each entry is a JSON line (key, times, validators, value size) followed by the
+    value bytes, after a JSON header line.
+    :return: Number of entries written.
+    """
+    path = os.fspath(path)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    with gzip.open(temporary, "wb") as file:
+        header = {"format": SNAPSHOT_FORMAT, "created_at": time.time()}
+        file.write(json.dumps(header).encode() + b"\n")
+        for key, entry in cache.items():
+            meta = {
+                "key": key,
+                "stored_at": entry.stored_at,
+                "expires_at": entry.expires_at,
+                "validators": entry.validators,
+                "size": len(entry.value),
+            }
+            file.write(json.dumps(meta).encode() + b"\n")
+            file.write(entry.value)
+            count += 1
+    os.replace(temporary, path)
+    return count
+
+
+def import_snapshot(cache, path, include_expired=True):
+    """
+    Load the entries of a snapshot file written by export_snapshot into a cache.
+    Entries keep their expiry time. Entries of the cache expiring later than the
+    imported ones are kept.
+    :param include_expired: Also import expired entries, which can still be revalidated or served stale. Default: True.
+    :return: Number of entries imported.
+    """
+    now = time.time()
+    count = 0
+    with gzip.open(os.fspath(path), "rb") as file:
+        header = json.loads(file.readline())
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(
+                f"Unsupported cache snapshot format: {header.get('format')}"
+            )
+        for line in file:
+            meta = json.loads(line)
+            value = file.read(meta["size"])
+            if not include_expired and meta["expires_at"] <= now:
+                continue
+            current = cache.get(meta["key"])
+            if current is not None and current.expires_at >= meta["expires_at"]:
+                continue
+            cache.set(meta["key"], value, meta["expires_at"] - now, meta["validators"])
+            count += 1
+    return count
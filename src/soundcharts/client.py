@@ -1,6 +1,10 @@
 import importlib.util
 import logging
+from . import api_util
 from .api_util import setup as api_setup
+from .api_util import close_session as api_close_session
+from .api_util import stop_loop as api_stop_loop
+from .cache import DAY
 from .search import Search, SearchAsync
 from .artist import Artist, ArtistAsync
 from .song import Song, SongAsync
@@ -28,13 +32,36 @@ class SoundchartsClient:
         app_id,
         api_key,
         base_url="https://customer.api.soundcharts.com",
-        parallel_requests=1,
+        parallel_requests=5,
         max_retries=5,
-        retry_delay=10,
+        retry_delay=1,
         timeout=10,
         console_log_level=logging.WARNING,
         file_log_level=logging.WARNING,
         exception_log_level=logging.ERROR,
+        connection_limit=100,
+        connection_limit_per_host=0,
+        keepalive_timeout=30,
+        rate_limit_pacing=True,
+        adaptive_concurrency=False,
+        parallel_requests_floor=1,
+        parallel_requests_ceiling=50,
+        retry_max_delay=60,
+        retry_budget=0.2,
+        json_decoder=None,
+        log_body_limit=1000,
+        file_log_queue=False,
+        coalesce_requests=False,
+        compression=True,
+        cache=None,
+        cache_ttls=None,
+        cache_history=True,
+        history_settle_days=3,
+        referential_snapshot=None,
+        referential_refresh=DAY,
+        negative_cache=None,
+        stale_while_revalidate=0,
+        stale_if_error=0,
     ):
         """
         Initialize the Soundcharts client. Use the logging python library to specify the logging level.
@@ -43,12 +70,35 @@ class SoundchartsClient:
         :param app_id: Soundcharts App ID
         :param api_key: Soundcharts API Key
         :param base_url: Base URL for API. Default: production.
-        :param parallel_requests: How many queries can run in parallel. Default: 1.
+        :param parallel_requests: How many queries can run in parallel, client-wide. Default: 5.
         :param max_retries: Max number of retries in case of an error 500. Default: 5.
-        :param retry_delay: Time in seconds between retries for a 500 error. Default: 10.
+        :param retry_delay: Base time in seconds before retrying a 500 error. It doubles with each attempt, with random jitter, unless the API sends a Retry-After header. Default: 1.
         :param console_log_level: The severity of issues written to the console. Default: logging.WARNING.
         :param file_log_level: The severity of issues written to the logging file. Default: logging.WARNING.
         :param exception_log_level: The severity of issues that cause exceptions. Default: logging.ERROR.
+        :param connection_limit: Max number of pooled connections kept open to the API. Default: 100.
+        :param connection_limit_per_host: Max number of pooled connections per host, 0 for no limit. Default: 0.
+        :param keepalive_timeout: Time in seconds an idle pooled connection is kept alive. Default: 30.
+        :param rate_limit_pacing: Spread requests out based on the API's rate limit headers to avoid 429 errors. Default: True.
+        :param adaptive_concurrency: Adjust the number of parallel requests to the observed latency and errors, starting from parallel_requests. Default: False.
+        :param parallel_requests_floor: Minimum number of parallel requests when adaptive_concurrency is on. Default: 1.
+        :param parallel_requests_ceiling: Maximum number of parallel requests when adaptive_concurrency is on. Default: 50.
+        :param retry_max_delay: Maximum time in seconds between retries. Default: 60.
+        :param retry_budget: Maximum share of recent requests that can be retries, client-wide. None: no limit. Default: 0.2.
+        :param json_decoder: JSON backend used to decode responses: "orjson", "msgspec", "json" or a callable taking bytes. Default: the fastest one installed.
+        :param log_body_limit: Max number of characters of request/response bodies written to debug logs. None: no limit. Default: 1000.
+        :param file_log_queue: Write the log file from a background thread instead of the calling thread. Default: False.
+        :param coalesce_requests: Identical GET requests made while one is in flight share its response instead of calling the API again. Default: False.
+        :param compression: Ask the API for compressed responses (gzip/deflate, plus brotli and zstd when installed). Default: True.
+        :param cache: Response cache. True for an in-memory cache of 64 MB, or a cache instance such as soundcharts.cache.MemoryCache(max_bytes=...) or soundcharts.cache.SQLiteCache(path). Default: None (no cache).
+        :param cache_ttls: Dictionary of endpoint patterns (regular expressions, e.g. r"/audience/") to cache durations in seconds, overriding the defaults: 7 days for referential data, 6 hours for metadata, 10 minutes for latest chart rankings. Default: None.
+        :param cache_history: With a cache, store daily time series (audience, popularity...) and only fetch the dates not stored yet. Default: True.
+        :param history_settle_days: Number of days after which time series values are considered final and are not fetched again. Default: 3.
+        :param referential_snapshot: Path of a referential snapshot file, or a ReferentialStore. Referential data (platforms, genres...) is then served from it without calling the API. None: disabled. Default: None.
+        :param referential_refresh: Age in seconds after which the referential snapshot is refreshed in the background. Default: 1 day.
+        :param negative_cache: NegativeCache remembering the lookups by identifier (ISRC, UPC, platform id...) that returned 404, so they aren't sent again. True: in-memory NegativeCache with default settings. None: disabled. Default: None.
+        :param stale_while_revalidate: Seconds after expiry during which a cached response is returned immediately while it is refreshed in the background. Default: 0.
+        :param stale_if_error: Seconds after expiry during which a cached response is returned when the API answers 5xx or 429, or can't be reached, instead of retrying. Default: 0.
         """
         self.base_url = base_url
 
@@ -63,6 +113,29 @@ class SoundchartsClient:
             console_log_level,
             file_log_level,
             exception_log_level,
+            connection_limit,
+            connection_limit_per_host,
+            keepalive_timeout,
+            rate_limit_pacing,
+            adaptive_concurrency,
+            parallel_requests_floor,
+            parallel_requests_ceiling,
+            retry_max_delay,
+            retry_budget,
+            json_decoder,
+            log_body_limit,
+            file_log_queue,
+            coalesce_requests,
+            compression,
+            cache,
+            cache_ttls,
+            cache_history,
+            history_settle_days,
+            referential_snapshot,
+            referential_refresh,
+            negative_cache,
+            stale_while_revalidate,
+            stale_if_error,
         )
 
         # Initialize submodules
@@ -89,6 +162,113 @@ class SoundchartsClient:
         except ModuleNotFoundError:
             self.test = None
 
+    @property
+    def limiter(self):
+        """
+        Client-wide concurrency limiter. Its in_flight and queued attributes give live counts.
+        """
+        return api_util.LIMITER
+
+    @property
+    def concurrency(self):
+        """
+        Adaptive concurrency controller. Its size attribute is the current number of parallel requests.
+        """
+        return api_util.CONCURRENCY
+
+    @property
+    def transfer_stats(self):
+        """
+        Bytes received per endpoint family, on the wire and decompressed. Use snapshot() to read them and reset() to clear them.
+        """
+        return api_util.TRANSFER_STATS
+
+    @property
+    def cache(self):
+        """
+        Response cache, None if caching is disabled.
+        """
+        return api_util.CACHE
+
+    @property
+    def cache_stats(self):
+        """
+        Cache hits, misses, stale responses, coalesced requests, API calls avoided and bytes saved per endpoint family, with the size and evictions of the cache. Use snapshot() to read them and reset() to clear them.
+        """
+        return api_util.CACHE_STATS
+
+    @property
+    def referential_store(self):
+        """
+        Referential snapshot store, None if disabled.
+        """
+        return api_util.REFERENTIAL_STORE
+
+    @property
+    def negative_cache(self):
+        """
+        Negative cache of 404 lookups, None if disabled.
+        """
+        return api_util.NEGATIVE_CACHE
+
+    def iter_pages(self, method, *args, prefetch=None, stop_when=None, **kwargs):
+        """
+        Iterate over the pages returned by a paginated method as they arrive, instead of gathering them in one response.
+        Example: for page in sc.iter_pages(sc.artist.get_artists, limit=None): ...
+        :param method: A paginated method of the client, called with the other arguments.
+        :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+        :param stop_when: Optional function called with each page, returning True to stop after it and cancel the pages being fetched.
+        :return: Generator of JSON responses, one per page.
+        """
+        return api_util.iter_pages(
+            method, *args, prefetch=prefetch, stop_when=stop_when, **kwargs
+        )
+
+    def iter_items(self, method, *args, prefetch=None, stop_when=None, **kwargs):
+        """
+        Iterate over the items returned by a paginated method as their pages arrive, see iter_pages.
+        :return: Generator of items.
+        """
+        return api_util.iter_items(
+            method, *args, prefetch=prefetch, stop_when=stop_when, **kwargs
+        )
+
+    def crawl(self, method, *args, checkpoint, prefetch=None, **kwargs):
+        """
+        Call a paginated method for every page (limit=None), saving each page to a checkpoint file as it arrives. If the crawl is interrupted, calling it again with the same arguments only fetches the missing pages. The file is deleted once the crawl is complete.
+        Example: sc.crawl(sc.artist.get_artists, checkpoint="artists.jsonl")
+        :param method: A paginated method of the client, called with the other arguments, except limit and offset.
+        :param checkpoint: Path of the checkpoint file.
+        :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+        :return: JSON response or an empty dictionary.
+        """
+        result = api_util.crawl(
+            method, *args, checkpoint=checkpoint, prefetch=prefetch, **kwargs
+        )
+        return result if result is not None else {}
+
+    def stop_when(self, stop_when):
+        """
+        Context manager making the paginated methods called in its block stop after the first page for which stop_when returns True, cancelling the pages after it.
+        Example: with sc.stop_when(lambda page: page["items"][-1]["rankDate"] < watermark): ...
+        :param stop_when: Function called with each page, returning True to stop after it.
+        """
+        return api_util.stop_pagination_when(stop_when)
+
+    def close(self):
+        """
+        Close the pooled HTTP session and stop the background event loop.
+        """
+        api_stop_loop()
+        if api_util.NEGATIVE_CACHE is not None:
+            api_util.NEGATIVE_CACHE.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def __repr__(self):
         return f"SoundchartsClient(base_url={self.base_url})"
 
@@ -103,13 +283,36 @@ class SoundchartsClientAsync:
         app_id,
         api_key,
         base_url="https://customer.api.soundcharts.com",
-        parallel_requests=1,
+        parallel_requests=5,
         max_retries=5,
-        retry_delay=10,
+        retry_delay=1,
         timeout=10,
         console_log_level=logging.WARNING,
         file_log_level=logging.WARNING,
         exception_log_level=logging.ERROR,
+        connection_limit=100,
+        connection_limit_per_host=0,
+        keepalive_timeout=30,
+        rate_limit_pacing=True,
+        adaptive_concurrency=False,
+        parallel_requests_floor=1,
+        parallel_requests_ceiling=50,
+        retry_max_delay=60,
+        retry_budget=0.2,
+        json_decoder=None,
+        log_body_limit=1000,
+        file_log_queue=False,
+        coalesce_requests=False,
+        compression=True,
+        cache=None,
+        cache_ttls=None,
+        cache_history=True,
+        history_settle_days=3,
+        referential_snapshot=None,
+        referential_refresh=DAY,
+        negative_cache=None,
+        stale_while_revalidate=0,
+        stale_if_error=0,
     ):
         """
         Initialize the Soundcharts client. Use the logging python library to specify the logging level.
@@ -118,12 +321,35 @@ class SoundchartsClientAsync:
         :param app_id: Soundcharts App ID
         :param api_key: Soundcharts API Key
         :param base_url: Base URL for API. Default: production.
-        :param parallel_requests: How many queries can run in parallel. Default: 1.
+        :param parallel_requests: How many queries can run in parallel, client-wide. Default: 5.
         :param max_retries: Max number of retries in case of an error 500. Default: 5.
-        :param retry_delay: Time in seconds between retries for a 500 error. Default: 10.
+        :param retry_delay: Base time in seconds before retrying a 500 error. It doubles with each attempt, with random jitter, unless the API sends a Retry-After header. Default: 1.
         :param console_log_level: The severity of issues written to the console. Default: logging.WARNING.
         :param file_log_level: The severity of issues written to the logging file. Default: logging.WARNING.
         :param exception_log_level: The severity of issues that cause exceptions. Default: logging.ERROR.
+        :param connection_limit: Max number of pooled connections kept open to the API. Default: 100.
+        :param connection_limit_per_host: Max number of pooled connections per host, 0 for no limit. Default: 0.
+        :param keepalive_timeout: Time in seconds an idle pooled connection is kept alive. Default: 30.
+        :param rate_limit_pacing: Spread requests out based on the API's rate limit headers to avoid 429 errors. Default: True.
+        :param adaptive_concurrency: Adjust the number of parallel requests to the observed latency and errors, starting from parallel_requests. Default: False.
+        :param parallel_requests_floor: Minimum number of parallel requests when adaptive_concurrency is on. Default: 1.
+        :param parallel_requests_ceiling: Maximum number of parallel requests when adaptive_concurrency is on. Default: 50.
+        :param retry_max_delay: Maximum time in seconds between retries. Default: 60.
+        :param retry_budget: Maximum share of recent requests that can be retries, client-wide. None: no limit. Default: 0.2.
+        :param json_decoder: JSON backend used to decode responses: "orjson", "msgspec", "json" or a callable taking bytes. Default: the fastest one installed.
+        :param log_body_limit: Max number of characters of request/response bodies written to debug logs. None: no limit. Default: 1000.
+        :param file_log_queue: Write the log file from a background thread instead of the calling thread. Default: False.
+        :param coalesce_requests: Identical GET requests made while one is in flight share its response instead of calling the API again. Default: False.
+        :param compression: Ask the API for compressed responses (gzip/deflate, plus brotli and zstd when installed). Default: True.
+        :param cache: Response cache. True for an in-memory cache of 64 MB, or a cache instance such as soundcharts.cache.MemoryCache(max_bytes=...) or soundcharts.cache.SQLiteCache(path). Default: None (no cache).
+        :param cache_ttls: Dictionary of endpoint patterns (regular expressions, e.g. r"/audience/") to cache durations in seconds, overriding the defaults: 7 days for referential data, 6 hours for metadata, 10 minutes for latest chart rankings. Default: None.
+        :param cache_history: With a cache, store daily time series (audience, popularity...) and only fetch the dates not stored yet. Default: True.
+        :param history_settle_days: Number of days after which time series values are considered final and are not fetched again. Default: 3.
+        :param referential_snapshot: Path of a referential snapshot file, or a ReferentialStore. Referential data (platforms, genres...) is then served from it without calling the API. None: disabled. Default: None.
+        :param referential_refresh: Age in seconds after which the referential snapshot is refreshed in the background. Default: 1 day.
+        :param negative_cache: NegativeCache remembering the lookups by identifier (ISRC, UPC, platform id...) that returned 404, so they aren't sent again. True: in-memory NegativeCache with default settings. None: disabled. Default: None.
+        :param stale_while_revalidate: Seconds after expiry during which a cached response is returned immediately while it is refreshed in the background. Default: 0.
+        :param stale_if_error: Seconds after expiry during which a cached response is returned when the API answers 5xx or 429, or can't be reached, instead of retrying. Default: 0.
         """
 
         self.base_url = base_url
@@ -139,6 +365,29 @@ class SoundchartsClientAsync:
             console_log_level,
             file_log_level,
             exception_log_level,
+            connection_limit,
+            connection_limit_per_host,
+            keepalive_timeout,
+            rate_limit_pacing,
+            adaptive_concurrency,
+            parallel_requests_floor,
+            parallel_requests_ceiling,
+            retry_max_delay,
+            retry_budget,
+            json_decoder,
+            log_body_limit,
+            file_log_queue,
+            coalesce_requests,
+            compression,
+            cache,
+            cache_ttls,
+            cache_history,
+            history_settle_days,
+            referential_snapshot,
+            referential_refresh,
+            negative_cache,
+            stale_while_revalidate,
+            stale_if_error,
         )
 
         # Initialize submodules
@@ -165,5 +414,112 @@ class SoundchartsClientAsync:
         except ModuleNotFoundError:
             self.test = None
 
+    @property
+    def limiter(self):
+        """
+        Client-wide concurrency limiter. Its in_flight and queued attributes give live counts.
+        """
+        return api_util.LIMITER
+
+    @property
+    def concurrency(self):
+        """
+        Adaptive concurrency controller. Its size attribute is the current number of parallel requests.
+        """
+        return api_util.CONCURRENCY
+
+    @property
+    def transfer_stats(self):
+        """
+        Bytes received per endpoint family, on the wire and decompressed. Use snapshot() to read them and reset() to clear them.
+        """
+        return api_util.TRANSFER_STATS
+
+    @property
+    def cache(self):
+        """
+        Response cache, None if caching is disabled.
+        """
+        return api_util.CACHE
+
+    @property
+    def cache_stats(self):
+        """
+        Cache hits, misses, stale responses, coalesced requests, API calls avoided and bytes saved per endpoint family, with the size and evictions of the cache. Use snapshot() to read them and reset() to clear them.
+        """
+        return api_util.CACHE_STATS
+
+    @property
+    def referential_store(self):
+        """
+        Referential snapshot store, None if disabled.
+        """
+        return api_util.REFERENTIAL_STORE
+
+    @property
+    def negative_cache(self):
+        """
+        Negative cache of 404 lookups, None if disabled.
+        """
+        return api_util.NEGATIVE_CACHE
+
+    def aiter_pages(self, method, *args, prefetch=None, stop_when=None, **kwargs):
+        """
+        Iterate over the pages returned by a paginated method as they arrive, instead of gathering them in one response.
+        Example: async for page in sc.aiter_pages(sc.artist.get_artists, limit=None): ...
+        :param method: A paginated method of the client, called with the other arguments.
+        :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+        :param stop_when: Optional function called with each page, returning True to stop after it and cancel the pages being fetched.
+        :return: Async generator of JSON responses, one per page.
+        """
+        return api_util.aiter_pages(
+            method, *args, prefetch=prefetch, stop_when=stop_when, **kwargs
+        )
+
+    def aiter_items(self, method, *args, prefetch=None, stop_when=None, **kwargs):
+        """
+        Iterate over the items returned by a paginated method as their pages arrive, see aiter_pages.
+        :return: Async generator of items.
+        """
+        return api_util.aiter_items(
+            method, *args, prefetch=prefetch, stop_when=stop_when, **kwargs
+        )
+
+    async def crawl(self, method, *args, checkpoint, prefetch=None, **kwargs):
+        """
+        Call a paginated method for every page (limit=None), saving each page to a checkpoint file as it arrives. If the crawl is interrupted, calling it again with the same arguments only fetches the missing pages. The file is deleted once the crawl is complete.
+        Example: await sc.crawl(sc.artist.get_artists, checkpoint="artists.jsonl")
+        :param method: A paginated method of the client, called with the other arguments, except limit and offset.
+        :param checkpoint: Path of the checkpoint file.
+        :param prefetch: Number of pages fetched ahead. Default: twice the parallel_requests limit.
+        :return: JSON response or an empty dictionary.
+        """
+        result = await api_util.crawl_async(
+            method, *args, checkpoint=checkpoint, prefetch=prefetch, **kwargs
+        )
+        return result if result is not None else {}
+
+    def stop_when(self, stop_when):
+        """
+        Context manager making the paginated methods called in its block stop after the first page for which stop_when returns True, cancelling the pages after it.
+        Example: with sc.stop_when(lambda page: page["items"][-1]["rankDate"] < watermark): ...
+        :param stop_when: Function called with each page, returning True to stop after it.
+        """
+        return api_util.stop_pagination_when(stop_when)
+
+    async def aclose(self):
+        """
+        Close the pooled HTTP session and its connections.
+        """
+        await api_close_session()
+        if api_util.NEGATIVE_CACHE is not None:
+            api_util.NEGATIVE_CACHE.save()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
     def __repr__(self):
         return f"SoundchartsClientAsync(base_url={self.base_url})"
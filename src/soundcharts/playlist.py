@@ -3,6 +3,8 @@ from .api_util import (
     request_looper,
     request_wrapper_async,
     request_looper_async,
+    request_series,
+    request_series_async,
     sort_items_by_date,
 )
 
@@ -181,7 +183,7 @@ class Playlist:
 
         endpoint = f"/api/v2.20/playlist/{playlist_uuid}/audience"
         params = {"startDate": start_date, "endDate": end_date}
-        result = request_looper(endpoint, params)
+        result = request_series(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True)
 
     @staticmethod
@@ -418,7 +420,7 @@ class PlaylistAsync:
 
         endpoint = f"/api/v2.20/playlist/{playlist_uuid}/audience"
         params = {"startDate": start_date, "endDate": end_date}
-        result = await request_looper_async(endpoint, params)
+        result = await request_series_async(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True)
 
     @staticmethod
@@ -3,6 +3,8 @@ from .api_util import (
     request_looper,
     request_wrapper_async,
     request_looper_async,
+    request_sharded,
+    request_sharded_async,
     sort_items_by_date,
 )
 
@@ -61,7 +63,7 @@ class Radio:
         :param start_date: Optional period start date (format YYYY-MM-DD).
         :param end_date: Optional period end date (format YYYY-MM-DD), leave empty for the latest results.
         :param offset: Pagination offset. Default: 0.
-        :param limit: Number of results to retrieve. None: no limit. Default: 100.
+        :param limit: Number of results to retrieve. None: no limit. Default: 100. With both dates and no limit, the range is fetched in parallel date windows.
         :return: JSON response or an empty dictionary.
         """
 
@@ -72,7 +74,7 @@ class Radio:
             "offset": offset,
             "limit": limit,
         }
-        result = request_looper(endpoint, params)
+        result = request_sharded(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True, key="airedAt")
 
     @staticmethod
@@ -151,7 +153,7 @@ class RadioAsync:
         :param start_date: Optional period start date (format YYYY-MM-DD).
         :param end_date: Optional period end date (format YYYY-MM-DD), leave empty for the latest results.
         :param offset: Pagination offset. Default: 0.
-        :param limit: Number of results to retrieve. None: no limit. Default: 100.
+        :param limit: Number of results to retrieve. None: no limit. Default: 100. With both dates and no limit, the range is fetched in parallel date windows.
         :return: JSON response or an empty dictionary.
         """
 
@@ -162,7 +164,7 @@ class RadioAsync:
             "offset": offset,
             "limit": limit,
         }
-        result = await request_looper_async(endpoint, params)
+        result = await request_sharded_async(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True, key="airedAt")
 
     @staticmethod
@@ -1,9 +1,23 @@
+import asyncio
+import copy
+import json
+import os
+import threading
+import time
+
 from .api_util import (
     request_wrapper,
     request_looper,
     request_wrapper_async,
     request_looper_async,
+    _STOP_WHEN,
+    _USE_REFERENTIAL_STORE,
+    _get_loop,
+    _normalize_params,
+    _run_blocking,
+    logger,
 )
+from .cache import DAY, MINUTE, cache_key
 
 
 class Referential:
@@ -334,3 +348,297 @@ class ReferentialAsync:
         }
         result = await request_looper_async(endpoint, params)
         return result if result is not None else {}
+
+
+# Snapshot file format version, increased when the layout changes
+SNAPSHOT_FORMAT = 1
+
+LYRICS_ATTRIBUTES = [
+    "themes",
+    "moods",
+    "culturalReferencePeople",
+    "culturalReferenceNonPeople",
+    "brands",
+    "locations",
+]
+
+# Datasets of a referential snapshot: name -> (endpoint, parameters).
+# Paginated datasets (with a limit parameter) are stored in full.
+SNAPSHOT_DATASETS = {
+    "platforms": ("/api/v2/referential/platforms", None),
+    "audience_platforms": ("/api/v2/referential/platforms/social", None),
+    "streaming_platforms": ("/api/v2/referential/platforms/streaming", None),
+    "song_chart_platforms": ("/api/v2/chart/song/platforms", None),
+    "album_chart_platforms": ("/api/v2/chart/album/platforms", None),
+    "playlist_platforms": ("/api/v2/playlist/platforms", None),
+    "radio_countries": ("/api/v2/radio/countries", {"limit": None}),
+    "artist_genres": ("/api/v2/artist/genres", {"genre": "all", "sortOrder": "asc"}),
+    "song_genres": (
+        "/api/v2/referential/song/genres",
+        {"genre": "all", "sortOrder": "asc"},
+    ),
+    "label_types": ("/api/v2/referential/label-types", None),
+    "distributors": ("/api/v2/referential/distributors", {"limit": None}),
+    **{
+        f"lyrics_{attribute}": (
+            "/api/v2/referential/lyrics-attributes",
+            {"attribute": attribute, "limit": None},
+        )
+        for attribute in LYRICS_ATTRIBUTES
+    },
+}
+
+
+class ReferentialStore:
+    """
+    Versioned snapshot of the referential datasets (platforms, genres, radio
+    countries, label types, distributors, lyrics attributes), kept in memory and in
+    a local JSON file.
+    Once set up on the client (referential_snapshot), requests for these datasets
+    are answered from memory without calling the API, paginated ones sliced by
+    offset and limit. The snapshot is loaded once when the client is set up, or
+    fetched if the file doesn't exist yet. Once older than refresh_interval, it is
+    refreshed in the background on the next lookup and the file is replaced
+    atomically, the previous version being served meanwhile.
+    Refreshes run on the event loop of the caller (the async client's loop), or
+    on the background loop of the sync API when no loop is running.
+    """
+
+    # Wait this many seconds before retrying a failed refresh
+    RETRY_INTERVAL = 5 * MINUTE
+
+    def __init__(self, path="soundcharts_referential.json", refresh_interval=DAY):
+        """
+        :param path: Path of the snapshot file, created if needed.
+        :param refresh_interval: Age in seconds after which the snapshot is refreshed. None: never. Default: 1 day.
+        """
+        self.path = os.fspath(path)
+        self.refresh_interval = refresh_interval
+        self.version = 0
+        self.created_at = 0
+        self._datasets = {}
+        self._responses = {}
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self._refresh = None
+        self._retry_at = 0
+
+    @staticmethod
+    def _key(endpoint, params):
+        params = {
+            k: v
+            for k, v in _normalize_params(params).items()
+            if k not in ("offset", "limit")
+        }
+        return cache_key("GET", endpoint, params)
+
+    def _set(self, datasets, version, created_at):
+        responses = {}
+        for name, response in datasets.items():
+            endpoint, params = SNAPSHOT_DATASETS[name]
+            paginated = "limit" in (params or {})
+            responses[self._key(endpoint, params)] = (response, paginated)
+        with self._lock:
+            self._datasets = datasets
+            self._responses = responses
+            self._indexes = {}
+            self.version = version
+            self.created_at = created_at
+
+    def load(self):
+        """
+        Load the snapshot file.
+        :return: True if a snapshot was loaded, False if the file is missing or has another format.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return False
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            logger.warning(
+                "Ignoring referential snapshot %s: unsupported format.", self.path
+            )
+            return False
+        datasets = {
+            name: response
+            for name, response in snapshot["datasets"].items()
+            if name in SNAPSHOT_DATASETS
+        }
+        self._set(datasets, snapshot["version"], snapshot["created_at"])
+        return True
+
+    def open(self):
+        """
+        Load the snapshot file, or fetch the datasets and create it if there is none.
+        Blocks until the datasets are available, unless an event loop is running:
+        they are then fetched in a task of that loop, and requests go to the API
+        until they are available.
+        """
+        if self.load():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            _run_blocking(self.refresh())
+            return
+        with self._lock:
+            self._start_refresh()
+
+    async def refresh(self):
+        """
+        Fetch every dataset from the API, then write the new version of the snapshot.
+        Datasets that can't be fetched keep their previous version.
+        :return: True if every dataset was fetched.
+        """
+
+        async def fetch(endpoint, params):
+            if "limit" in (params or {}):
+                return await request_looper_async(endpoint, params)
+            return await request_wrapper_async(endpoint, params)
+
+        token = _USE_REFERENTIAL_STORE.set(False)
+        stop_token = _STOP_WHEN.set(None)
+        try:
+            responses = await asyncio.gather(
+                *(fetch(*request) for request in SNAPSHOT_DATASETS.values()),
+                return_exceptions=True,
+            )
+        finally:
+            _STOP_WHEN.reset(stop_token)
+            _USE_REFERENTIAL_STORE.reset(token)
+
+        datasets = dict(self._datasets)
+        complete = True
+        for name, response in zip(SNAPSHOT_DATASETS, responses):
+            if isinstance(response, BaseException) or not response:
+                logger.warning("Could not refresh referential dataset %s.", name)
+                complete = False
+                continue
+            datasets[name] = response
+        if not datasets:
+            return False
+
+        version, created_at = self.version + 1, time.time()
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "version": version,
+            "created_at": created_at,
+            "datasets": datasets,
+        }
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        os.replace(temporary, self.path)
+        self._set(datasets, version, created_at)
+        logger.info(
+            "Referential snapshot %s updated to version %s.", self.path, version
+        )
+        return complete
+
+    @property
+    def is_stale(self):
+        return (
+            self.refresh_interval is not None
+            and time.time() - self.created_at > self.refresh_interval
+        )
+
+    def _refresh_if_stale(self):
+        if not self.is_stale or time.time() < self._retry_at:
+            return
+        with self._lock:
+            if self._refresh is not None and not self._refresh.done():
+                return
+            self._retry_at = time.time() + self.RETRY_INTERVAL
+            self._start_refresh()
+
+    def _start_refresh(self):
+        # The limiter isn't thread-safe: refresh on the loop sending the requests
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._refresh = asyncio.run_coroutine_threadsafe(
+                self._refresh_in_background(), _get_loop()
+            )
+        else:
+            self._refresh = loop.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self):
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Referential snapshot refresh failed.")
+
+    def stop(self):
+        """
+        Cancel the background refresh in progress, if any.
+        """
+        with self._lock:
+            refresh, self._refresh = self._refresh, None
+        if isinstance(refresh, asyncio.Task):
+            loop = refresh.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(refresh.cancel)
+        elif refresh is not None:
+            refresh.cancel()
+
+    def response(self, endpoint, params=None):
+        """
+        Return a copy of the stored response of a request, or None if it isn't stored.
+        Paginated responses are sliced with the offset and limit parameters.
+        """
+        stored = self._responses.get(self._key(endpoint, params))
+        if stored is None:
+            return None
+        self._refresh_if_stale()
+        response, paginated = stored
+        response = copy.deepcopy(response)
+        if paginated and isinstance(response.get("items"), list):
+            params = params or {}
+            offset = int(params.get("offset") or 0)
+            limit = params.get("limit")
+            end = offset + int(limit) if limit else None
+            items = response["items"]
+            response["items"] = items[offset:end]
+            response["page"] = dict(response.get("page") or {})
+            response["page"].update(offset=offset, limit=len(response["items"]))
+            response["page"].setdefault("total", len(items))
+            response["page"]["next"] = None
+            if end is not None and end < len(items):
+                response["page"]["next"] = f"{endpoint}?offset={end}&limit={limit}"
+        return response
+
+    def get(self, name):
+        """
+        Return a copy of a dataset, see SNAPSHOT_DATASETS for the names.
+        :return: JSON response or an empty dictionary.
+        """
+        self._refresh_if_stale()
+        return copy.deepcopy(self._datasets.get(name, {}))
+
+    def index(self, name, field):
+        """
+        Return the items of a dataset by the value of one of their fields, e.g.
+        index("platforms", "code")["spotify"]. Indexes are built once per version.
+        Don't modify the returned dictionary or its items.
+        """
+        self._refresh_if_stale()
+        indexes = self._indexes
+        index = indexes.get((name, field))
+        if index is None:
+            items = (self._datasets.get(name) or {}).get("items") or []
+            index = {item[field]: item for item in items if field in item}
+            indexes[(name, field)] = index
+        return index
+
+    def lookup(self, name, field, value):
+        """
+        Return the item of a dataset whose field has the given value, or None.
+        """
+        return self.index(name, field).get(value)
+
+    def __repr__(self):
+        return (
+            f"ReferentialStore(path={self.path!r}, version={self.version}, "
+            f"datasets={len(self._datasets)})"
+        )
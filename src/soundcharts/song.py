@@ -3,6 +3,10 @@ from .api_util import (
     request_looper,
     request_wrapper_async,
     request_looper_async,
+    request_sharded,
+    request_sharded_async,
+    request_series,
+    request_series_async,
     sort_items_by_date,
 )
 
@@ -171,7 +175,7 @@ class Song:
             "endDate": end_date,
             "identifier": identifier,
         }
-        result = request_looper(endpoint, params)
+        result = request_series(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True)
 
     @staticmethod
@@ -187,7 +191,7 @@ class Song:
         """
         endpoint = f"/api/v2/song/{song_uuid}/popularity/{platform}"
         params = {"startDate": start_date, "endDate": end_date}
-        result = request_looper(endpoint, params)
+        result = request_series(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True)
 
     @staticmethod
@@ -318,7 +322,7 @@ class Song:
         :param start_date: Optional period start date (format YYYY-MM-DD).
         :param end_date: Optional period end date (format YYYY-MM-DD), leave empty for the latest results.
         :param offset: Pagination offset. Default: 0.
-        :param limit: Number of results to retrieve. None: no limit. Default: 100.
+        :param limit: Number of results to retrieve. None: no limit. Default: 100. With both dates and no limit, the range is fetched in parallel date windows.
         :return: JSON response or an empty dictionary.
         """
 
@@ -331,7 +335,7 @@ class Song:
             "offset": offset,
             "limit": limit,
         }
-        result = request_looper(endpoint, params)
+        result = request_sharded(endpoint, params)
         return {} if result is None else sort_items_by_date(result, key="airedAt")
 
     @staticmethod
@@ -554,7 +558,7 @@ class SongAsync:
             "endDate": end_date,
             "identifier": identifier,
         }
-        result = await request_looper_async(endpoint, params)
+        result = await request_series_async(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True)
 
     @staticmethod
@@ -572,7 +576,7 @@ class SongAsync:
         """
         endpoint = f"/api/v2/song/{song_uuid}/popularity/{platform}"
         params = {"startDate": start_date, "endDate": end_date}
-        result = await request_looper_async(endpoint, params)
+        result = await request_series_async(endpoint, params)
         return {} if result is None else sort_items_by_date(result, True)
 
     @staticmethod
@@ -703,7 +707,7 @@ class SongAsync:
         :param start_date: Optional period start date (format YYYY-MM-DD).
         :param end_date: Optional period end date (format YYYY-MM-DD), leave empty for the latest results.
         :param offset: Pagination offset. Default: 0.
-        :param limit: Number of results to retrieve. None: no limit. Default: 100.
+        :param limit: Number of results to retrieve. None: no limit. Default: 100. With both dates and no limit, the range is fetched in parallel date windows.
         :return: JSON response or an empty dictionary.
         """
 
@@ -716,7 +720,7 @@ class SongAsync:
             "offset": offset,
             "limit": limit,
         }
-        result = await request_looper_async(endpoint, params)
+        result = await request_sharded_async(endpoint, params)
         return {} if result is None else sort_items_by_date(result, key="airedAt")
 
     @staticmethod
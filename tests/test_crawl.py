@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from soundcharts import SoundchartsClientAsync
+
+TOTAL = 950
+OFFSETS = list(range(0, TOTAL, 100))
+
+
+def run_crawls(checkpoint, runs, **kwargs):
+    """
+    Crawl the artists of a local stand-in of the API once per (failing, prepare)
+    item of runs: during the run, the server answers the page offsets in failing
+    with 404, and prepare(checkpoint) is called before it if given. Return the
+    offsets requested and the result of each run.
+    """
+    requested, failing = [], set()
+
+    async def artists(request):
+        offset = int(request.query.get("offset", 0))
+        requested[-1].append(offset)
+        if offset in failing:
+            return web.json_response({"errors": []}, status=404)
+        limit = int(request.query["limit"])
+        items = [{"i": i} for i in range(offset, min(offset + limit, TOTAL))]
+        page = {"offset": offset, "limit": limit, "total": TOTAL, "next": None}
+        return web.json_response({"items": items, "page": page, "errors": []})
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/api/v2/top/artists", artists)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        sc = SoundchartsClientAsync(
+            "app_id", "api_key", base_url=f"http://127.0.0.1:{port}"
+        )
+        results = []
+        try:
+            for fail, prepare in runs:
+                failing.clear()
+                failing.update(fail)
+                requested.append([])
+                if prepare is not None:
+                    prepare(checkpoint)
+                results.append(
+                    await sc.crawl(
+                        sc.artist.get_artists, checkpoint=checkpoint, **kwargs
+                    )
+                )
+        finally:
+            await sc.aclose()
+            await runner.cleanup()
+        return results
+
+    results = asyncio.run(main())
+    return [sorted(offsets) for offsets in requested], results
+
+
+def item_ids(result):
+    return [item["i"] for item in result["items"]]
+
+
+def test_crawl_resumes_missing_pages(tmp_path):
+    checkpoint = tmp_path / "artists.jsonl"
+    requested, (partial, complete) = run_crawls(
+        checkpoint, [({300, 400}, None), (set(), None)]
+    )
+
+    assert requested[0] == OFFSETS
+    assert item_ids(partial) == [i for i in range(TOTAL) if not 300 <= i < 500]
+    assert requested[1] == [300, 400]
+    assert item_ids(complete) == list(range(TOTAL))
+    assert complete["page"]["next"] is None
+    assert not checkpoint.exists()
+
+
+def test_crawl_keeps_pages_written_after_a_torn_line(tmp_path):
+    checkpoint = tmp_path / "artists.jsonl"
+
+    def tear(path):
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"offset": 300, "ite')
+
+    requested, results = run_crawls(
+        checkpoint,
+        [
+            (set(OFFSETS[3:]), None),
+            (set(OFFSETS[6:]), tear),
+            (set(), None),
+        ],
+    )
+
+    assert requested[1] == OFFSETS[3:]
+    # The pages of the second run were saved despite the torn line before them
+    assert requested[2] == OFFSETS[6:]
+    assert item_ids(results[2]) == list(range(TOTAL))
+
+
+@pytest.mark.parametrize("content", ["", '{"format": 1, "fing', "[]"])
+def test_crawl_starts_over_from_an_unreadable_checkpoint(tmp_path, content):
+    checkpoint = tmp_path / "artists.jsonl"
+
+    def write(path):
+        path.write_text(content)
+
+    requested, (result,) = run_crawls(checkpoint, [(set(), write)])
+
+    assert requested[0] == OFFSETS
+    assert item_ids(result) == list(range(TOTAL))
+
+
+def test_crawl_ignores_a_checkpoint_of_another_query(tmp_path):
+    checkpoint = tmp_path / "artists.jsonl"
+    run_crawls(checkpoint, [({500}, None)], body={"sort": {"order": "asc"}})
+    assert json.loads(checkpoint.read_text().splitlines()[0])["total"] == TOTAL
+
+    requested, (result,) = run_crawls(checkpoint, [(set(), None)])
+
+    assert requested[0] == OFFSETS
+    assert item_ids(result) == list(range(TOTAL))
+
+
+@pytest.mark.parametrize("kwargs", [{"limit": 200}, {"offset": 100}])
+def test_crawl_rejects_limit_and_offset(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        run_crawls(tmp_path / "artists.jsonl", [(set(), None)], **kwargs)
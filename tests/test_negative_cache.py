@@ -0,0 +1,98 @@
+from soundcharts.cache import DAY, NegativeCache
+
+KEY = "GET /api/v2.25/song/by-isrc/USUM71900001"
+OTHER_KEY = "GET /api/v2.25/song/by-isrc/USUM71900002"
+
+
+def age(negative_cache, seconds):
+    # Make the current filter older instead of waiting
+    negative_cache.started_at -= seconds
+
+
+def test_add_and_contains():
+    negative_cache = NegativeCache(capacity=1000)
+    negative_cache.add(KEY)
+    assert KEY in negative_cache
+    assert OTHER_KEY not in negative_cache
+
+
+def test_applies_to_lookups_by_identifier_only():
+    negative_cache = NegativeCache(capacity=1000)
+    assert negative_cache.applies("song/by-isrc/{id}")
+    assert negative_cache.applies("album/by-platform/spotify/{id}")
+    assert not negative_cache.applies("song/{id}/audience/spotify")
+
+
+def test_misses_survive_one_rotation():
+    negative_cache = NegativeCache(ttl=2 * DAY, capacity=1000)
+    negative_cache.add(KEY)
+
+    age(negative_cache, DAY)
+    assert KEY in negative_cache
+    negative_cache.add(OTHER_KEY)
+
+    # KEY was added two rotations ago, OTHER_KEY one
+    age(negative_cache, DAY)
+    assert KEY not in negative_cache
+    assert OTHER_KEY in negative_cache
+
+
+def test_misses_expire_after_ttl_without_lookups():
+    negative_cache = NegativeCache(ttl=2 * DAY, capacity=1000)
+    negative_cache.add(KEY)
+    age(negative_cache, 2 * DAY)
+    assert KEY not in negative_cache
+
+
+def test_clear():
+    negative_cache = NegativeCache(capacity=1000)
+    negative_cache.add(KEY)
+    negative_cache.clear()
+    assert KEY not in negative_cache
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "negative_cache.bin"
+    negative_cache = NegativeCache(path, ttl=2 * DAY, capacity=1000)
+    negative_cache.add(KEY)
+    age(negative_cache, DAY)
+    negative_cache.add(OTHER_KEY)
+    negative_cache.save()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    loaded = NegativeCache(path, ttl=2 * DAY, capacity=1000)
+    assert KEY in loaded
+    assert OTHER_KEY in loaded
+    assert loaded.started_at == negative_cache.started_at
+
+
+def test_load_rotates_filters_saved_long_ago(tmp_path):
+    path = tmp_path / "negative_cache.bin"
+    negative_cache = NegativeCache(path, ttl=2 * DAY, capacity=1000)
+    negative_cache.add(KEY)
+    age(negative_cache, 2 * DAY)
+    negative_cache.save()
+
+    assert KEY not in NegativeCache(path, ttl=2 * DAY, capacity=1000)
+
+
+def test_load_ignores_files_saved_with_other_settings(tmp_path):
+    path = tmp_path / "negative_cache.bin"
+    negative_cache = NegativeCache(path, capacity=1000)
+    negative_cache.add(KEY)
+    negative_cache.save()
+
+    other_capacity = NegativeCache(None, capacity=5000)
+    other_capacity.path = str(path)
+    assert not other_capacity.load()
+    assert KEY not in other_capacity
+
+    other_ttl = NegativeCache(None, ttl=DAY, capacity=1000)
+    other_ttl.path = str(path)
+    assert not other_ttl.load()
+
+
+def test_load_without_file(tmp_path):
+    negative_cache = NegativeCache(tmp_path / "missing.bin", capacity=1000)
+    assert not negative_cache.load()
+    assert KEY not in negative_cache
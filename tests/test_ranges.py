@@ -0,0 +1,68 @@
+from datetime import date
+
+from soundcharts.cache import add_range, missing_ranges
+
+
+def d(day, month=1):
+    return date(2025, month, day)
+
+
+def test_missing_ranges_without_coverage():
+    assert missing_ranges([], d(1), d(31)) == [(d(1), d(31))]
+
+
+def test_missing_ranges_around_and_between_covered_ranges():
+    covered = [(d(5), d(10)), (d(15), d(20))]
+    assert missing_ranges(covered, d(1), d(31)) == [
+        (d(1), d(4)),
+        (d(11), d(14)),
+        (d(21), d(31)),
+    ]
+
+
+def test_missing_ranges_inside_a_covered_range():
+    assert missing_ranges([(d(1), d(31))], d(5), d(10)) == []
+
+
+def test_missing_ranges_with_bounds_on_covered_edges():
+    covered = [(d(5), d(10))]
+    assert missing_ranges(covered, d(10), d(12)) == [(d(11), d(12))]
+    assert missing_ranges(covered, d(3), d(5)) == [(d(3), d(4))]
+
+
+def test_missing_ranges_ignores_ranges_outside_bounds():
+    covered = [(d(1), d(3)), (d(25), d(31))]
+    assert missing_ranges(covered, d(10), d(12)) == [(d(10), d(12))]
+
+
+def test_missing_ranges_single_day():
+    assert missing_ranges([(d(2), d(2))], d(1), d(3)) == [(d(1), d(1)), (d(3), d(3))]
+
+
+def test_add_range_to_empty():
+    assert add_range([], d(1), d(5)) == [(d(1), d(5))]
+
+
+def test_add_range_merges_overlapping_and_adjacent_ranges():
+    covered = [(d(1), d(5)), (d(10), d(15))]
+    assert add_range(covered, d(4), d(9)) == [(d(1), d(15))]
+    assert add_range(covered, d(6), d(6)) == [(d(1), d(6)), (d(10), d(15))]
+
+
+def test_add_range_keeps_separate_ranges_sorted():
+    covered = [(d(10), d(15))]
+    assert add_range(covered, d(1), d(3)) == [(d(1), d(3)), (d(10), d(15))]
+    assert add_range(covered, d(20), d(25)) == [(d(10), d(15)), (d(20), d(25))]
+
+
+def test_add_range_across_months():
+    covered = [(d(1), d(31))]
+    assert add_range(covered, d(1, 2), d(10, 2)) == [(d(1), d(10, 2))]
+
+
+def test_add_range_covers_what_was_missing():
+    covered = [(d(5), d(10)), (d(15), d(20))]
+    for start, end in missing_ranges(covered, d(1), d(31)):
+        covered = add_range(covered, start, end)
+    assert covered == [(d(1), d(31))]
+    assert missing_ranges(covered, d(1), d(31)) == []
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+from aiohttp import web
+
+from soundcharts import SoundchartsClientAsync
+from soundcharts.cache import MemoryCache
+
+ARTIST_UUID = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+BODY = json.dumps({"object": {"uuid": ARTIST_UUID, "name": "Billie Eilish"}}).encode()
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 06 Jan 2025 10:00:00 GMT"
+
+
+def run_revalidation(validator_header, conditional_header, validator):
+    """
+    Request the same artist twice from a local stand-in of the API, the cached
+    response expiring in between, and return the conditional header of each
+    request, the two responses and the client statistics.
+    """
+    sent = []
+
+    async def artist(request):
+        condition = request.headers.get(conditional_header)
+        sent.append(condition)
+        headers = {validator_header: validator}
+        if condition == validator:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=BODY, content_type="application/json", headers=headers)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/{version}/artist/{uuid}", artist)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        sc = SoundchartsClientAsync(
+            "app_id",
+            "api_key",
+            base_url=f"http://127.0.0.1:{port}",
+            cache=MemoryCache(),
+            cache_ttls={r"^artist/\{id\}$": 0.05},
+        )
+        sc.transfer_stats.reset()
+        sc.cache_stats.reset()
+        try:
+            first = await sc.artist.get_artist_metadata(ARTIST_UUID)
+            await asyncio.sleep(0.1)
+            second = await sc.artist.get_artist_metadata(ARTIST_UUID)
+            transfer = sc.transfer_stats.snapshot()["total"]
+            cache = sc.cache_stats.snapshot()["total"]
+        finally:
+            await sc.aclose()
+            await runner.cleanup()
+        return first, second, transfer, cache
+
+    first, second, transfer, cache = asyncio.run(main())
+    return sent, first, second, transfer, cache
+
+
+def check_revalidated(sent, first, second, transfer, cache, validator):
+    assert sent == [None, validator]
+    assert first == second == json.loads(BODY)
+
+    assert transfer["responses"] == 2
+    assert transfer["not_modified"] == 1
+    assert transfer["body_bytes"] == 2 * len(BODY)
+    assert transfer["saved_bytes"] >= len(BODY)
+
+    # The expired entry is a miss too: the API was called to revalidate it
+    assert cache["misses"] == 2
+    assert cache["revalidated"] == 1
+    assert cache["saved_bytes"] == len(BODY)
+
+
+def test_etag_revalidation():
+    sent, first, second, transfer, cache = run_revalidation(
+        "ETag", "If-None-Match", ETAG
+    )
+    check_revalidated(sent, first, second, transfer, cache, ETAG)
+
+
+def test_last_modified_revalidation():
+    sent, first, second, transfer, cache = run_revalidation(
+        "Last-Modified", "If-Modified-Since", LAST_MODIFIED
+    )
+    check_revalidated(sent, first, second, transfer, cache, LAST_MODIFIED)